@@ -2,6 +2,7 @@ package cmd
 
 import (
 	"bufio"
+	"bytes"
 	"context"
 	"encoding/json"
 	"fmt"
@@ -46,17 +47,33 @@ var streamCmd = &cobra.Command{
 		}
 
 		scanner := bufio.NewScanner(resp.Body)
+		scanner.Buffer(make([]byte, 0, 64*1024), 1024*1024)
 		enc := json.NewEncoder(os.Stdout)
 		if !streamFlags.compact {
 			enc.SetIndent("", "  ")
 		}
 
+		dataPrefix := []byte("data: ")
+		var out []byte
 		for scanner.Scan() {
-			line := scanner.Text()
-			if strings.HasPrefix(line, "data: ") {
-				data := line[6:]
+			// Work on the scanner's bytes: Text() would copy each line into a string
+			// only for it to be copied back to []byte for Unmarshal
+			line := scanner.Bytes()
+			if bytes.HasPrefix(line, dataPrefix) {
+				data := line[len(dataPrefix):]
+				if streamFlags.compact {
+					// The server already emits compact JSON, so valid events are
+					// written through in one write instead of decoded and re-encoded
+					if json.Valid(data) {
+						out = append(append(out[:0], data...), '\n')
+						if _, err := os.Stdout.Write(out); err != nil {
+							fmt.Fprintf(os.Stderr, "error writing: %v\n", err)
+						}
+					}
+					continue
+				}
 				var snap model.Snapshot
-				if err := json.Unmarshal([]byte(data), &snap); err == nil {
+				if err := json.Unmarshal(data, &snap); err == nil {
 					if err := enc.Encode(snap); err != nil {
 						fmt.Fprintf(os.Stderr, "error encoding: %v\n", err)
 					}
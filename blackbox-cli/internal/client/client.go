@@ -2,10 +2,10 @@ package client
 
 import (
 	"bufio"
+	"bytes"
 	"context"
 	"encoding/json"
 	"fmt"
-	"io"
 	"net/http"
 	"net/url"
 	"strings"
@@ -16,21 +16,52 @@ import (
 )
 
 type Client struct {
-	baseURL  string
-	endpoint string
-	http     *http.Client
+	baseURL   string
+	endpoint  string
+	http      *http.Client
+	transport *http.Transport
 }
 
 func New(baseURL, endpoint string, timeout time.Duration) *Client {
+	// Each client owns a keep-alive transport so repeated polls against the
+	// same endpoint reuse pooled connections instead of dialing every time.
+	transport := &http.Transport{
+		Proxy:               http.ProxyFromEnvironment,
+		MaxIdleConns:        8,
+		MaxIdleConnsPerHost: 4,
+		IdleConnTimeout:     90 * time.Second,
+	}
 	return &Client{
-		baseURL:  baseURL,
-		endpoint: endpoint,
+		baseURL:   baseURL,
+		endpoint:  endpoint,
+		transport: transport,
 		http: &http.Client{
-			Timeout: timeout,
+			Timeout:   timeout,
+			Transport: transport,
 		},
 	}
 }
 
+// WithTimeout returns a client for the same endpoint with a different overall
+// request timeout. It shares the receiver's transport, so one-off actions reuse
+// the connections already pooled for polling.
+func (c *Client) WithTimeout(timeout time.Duration) *Client {
+	return &Client{
+		baseURL:   c.baseURL,
+		endpoint:  c.endpoint,
+		transport: c.transport,
+		http: &http.Client{
+			Timeout:   timeout,
+			Transport: c.transport,
+		},
+	}
+}
+
+// Close releases idle pooled connections held by the client.
+func (c *Client) Close() {
+	c.transport.CloseIdleConnections()
+}
+
 func (c *Client) Snapshot(ctx context.Context) (*model.Snapshot, error) {
 	fullURL := c.baseURL + c.endpoint
 
@@ -94,9 +125,11 @@ func (c *Client) AggregatedSnapshot(ctx context.Context, windowSeconds int) (*mo
 		return nil, fmt.Errorf("failed to create request: %w", err)
 	}
 
-	// Use a longer timeout for aggregated requests (window + 10 seconds buffer)
+	// Use a longer timeout for aggregated requests (window + 10 seconds buffer),
+	// sharing the pooled transport with the other calls
 	aggClient := &http.Client{
-		Timeout: time.Duration(windowSeconds+10) * time.Second,
+		Timeout:   time.Duration(windowSeconds+10) * time.Second,
+		Transport: c.transport,
 	}
 
 	resp, err := aggClient.Do(req)
@@ -119,8 +152,10 @@ func (c *Client) AggregatedSnapshot(ctx context.Context, windowSeconds int) (*mo
 
 	utils.Debug("AggregatedSnapshot received: window=%ds, samples=%d, used_kv_cache_bytes.avg=%.2f, used_kv_cache_bytes.count=%d, models=%d",
 		aggSnap.WindowSeconds, aggSnap.SampleCount, aggSnap.UsedKVCacheBytes.Avg, aggSnap.UsedKVCacheBytes.Count, len(aggSnap.Models))
-	for i, m := range aggSnap.Models {
-		utils.Debug("  Model[%d]: %s, UsedKVCacheBytes=%d, AllocatedVRAMBytes=%d", i, m.ModelID, m.UsedKVCacheBytes, m.AllocatedVRAMBytes)
+	if utils.DebugEnabled() {
+		for i, m := range aggSnap.Models {
+			utils.Debug("  Model[%d]: %s, UsedKVCacheBytes=%d, AllocatedVRAMBytes=%d", i, m.ModelID, m.UsedKVCacheBytes, m.AllocatedVRAMBytes)
+		}
 	}
 
 	return &aggSnap, nil
@@ -145,23 +180,11 @@ func (c *Client) Stream(ctx context.Context, onSnapshot func(*model.Snapshot) er
 	req.Header.Set("Cache-Control", "no-cache")
 	req.Header.Set("Connection", "keep-alive")
 
-	// Create a completely isolated HTTP client for SSE
-	// The server sends multiple HTTP responses on the same connection (each SSE event is a full HTTP response)
-	// We need to disable connection pooling entirely to prevent "unsolicited response" errors
-	transport := &http.Transport{
-		DisableKeepAlives:   true, // Disable keep-alive to prevent connection reuse
-		MaxIdleConns:        0,    // No connection pooling
-		MaxIdleConnsPerHost: 0,    // No per-host pooling
-		IdleConnTimeout:     0,    // No timeout
-		DisableCompression:  true, // Disable compression for SSE
-		// Force new connection for each request
-		ForceAttemptHTTP2: false, // Disable HTTP/2 which has different connection handling
-	}
-
-	// Create a dedicated client that won't interfere with other requests
+	// The server answers with one long-lived chunked response, so the stream can
+	// share the pooled transport; only the overall request timeout is dropped
 	streamClient := &http.Client{
 		Timeout:   0, // No timeout for streaming
-		Transport: transport,
+		Transport: c.transport,
 		// Don't follow redirects
 		CheckRedirect: func(req *http.Request, via []*http.Request) error {
 			return http.ErrUseLastResponse
@@ -184,13 +207,13 @@ func (c *Client) Stream(ctx context.Context, onSnapshot func(*model.Snapshot) er
 		return fmt.Errorf("unexpected content type: %s (expected text/event-stream)", contentType)
 	}
 
-	// The server sends each SSE event as a separate HTTP response
-	// We need to read the raw stream and parse multiple HTTP responses
-	reader := bufio.NewReader(resp.Body)
-	var currentData strings.Builder
-	skipUntilEmptyLine := false
+	// Lines are matched as bytes straight out of the scanner's buffer; only the
+	// current event's payload is copied (into a reused buffer) before Unmarshal.
+	scanner := bufio.NewScanner(resp.Body)
+	scanner.Buffer(make([]byte, 0, 64*1024), 1024*1024)
+	var currentData []byte
 
-	for {
+	for scanner.Scan() {
 		// Check for context cancellation
 		select {
 		case <-ctx.Done():
@@ -198,52 +221,17 @@ func (c *Client) Stream(ctx context.Context, onSnapshot func(*model.Snapshot) er
 		default:
 		}
 
-		// Read line by line
-		line, err := reader.ReadString('\n')
-		if err != nil {
-			if err == io.EOF {
-				// Process any remaining data before EOF
-				if currentData.Len() > 0 {
-					data := currentData.String()
-					currentData.Reset()
-					var snap model.Snapshot
-					if json.Unmarshal([]byte(data), &snap) == nil {
-						onSnapshot(&snap)
-					}
-				}
-				return nil
-			}
-			return fmt.Errorf("stream read error: %w", err)
-		}
-
-		line = strings.TrimRight(line, "\r\n")
-
-		// Handle HTTP response headers that appear in the stream
-		// The server sends multiple HTTP responses, each starting with headers
-		if strings.HasPrefix(line, "HTTP/") {
-			// New HTTP response - skip headers until empty line
-			skipUntilEmptyLine = true
-			currentData.Reset()
-			continue
-		}
-
-		if skipUntilEmptyLine {
-			if line == "" {
-				// End of headers, start reading SSE data
-				skipUntilEmptyLine = false
-			}
-			continue
-		}
+		// Scanner strips the trailing "\r\n" / "\n"
+		line := scanner.Bytes()
 
 		// Parse SSE format
-		if line == "" {
+		if len(line) == 0 {
 			// Empty line indicates end of SSE event
-			if currentData.Len() > 0 {
-				data := currentData.String()
-				currentData.Reset()
-
+			if len(currentData) > 0 {
 				var snap model.Snapshot
-				if err := json.Unmarshal([]byte(data), &snap); err != nil {
+				err := json.Unmarshal(currentData, &snap)
+				currentData = currentData[:0]
+				if err != nil {
 					// Skip malformed JSON
 					continue
 				}
@@ -255,26 +243,40 @@ func (c *Client) Stream(ctx context.Context, onSnapshot func(*model.Snapshot) er
 			continue
 		}
 
-		// Handle SSE field lines
-		if strings.HasPrefix(line, "data: ") {
+		// Handle SSE field lines; comments (":") and other fields (event:, id:)
+		// are ignored
+		if bytes.HasPrefix(line, dataPrefix) {
 			// Extract data after "data: " prefix
-			data := strings.TrimSpace(line[6:])
-			if data != "" {
-				currentData.Reset()
-				currentData.WriteString(data)
+			data := bytes.TrimSpace(line[len(dataPrefix):])
+			if len(data) > 0 {
+				currentData = append(currentData[:0], data...)
 			}
-		} else if strings.HasPrefix(line, ":") {
-			// SSE comment - ignore
-			continue
-		} else if strings.HasPrefix(line, "event:") {
-			// SSE metadata - ignore
-			continue
-		} else if strings.HasPrefix(line, "id:") {
-			// SSE metadata - ignore
-			continue
 		}
-		// Ignore any other lines (could be HTTP headers from subsequent responses)
 	}
+
+	if err := scanner.Err(); err != nil {
+		if ctx.Err() != nil {
+			return ctx.Err()
+		}
+		return fmt.Errorf("stream read error: %w", err)
+	}
+
+	// Process any remaining data before EOF
+	if len(currentData) > 0 {
+		var snap model.Snapshot
+		if json.Unmarshal(currentData, &snap) == nil {
+			onSnapshot(&snap)
+		}
+	}
+	return nil
+}
+
+var dataPrefix = []byte("data: ")
+
+type deployRequest struct {
+	ModelID string `json:"model_id"`
+	HFToken string `json:"hf_token,omitempty"`
+	Port    string `json:"port,omitempty"`
 }
 
 type DeployResponse struct {
@@ -297,23 +299,13 @@ func (c *Client) DeployModel(ctx context.Context, modelID, hfToken, port string)
 		return nil, fmt.Errorf("invalid URL %q: %w", deployURL, err)
 	}
 
-	// Build JSON payload
-	payload := map[string]interface{}{
-		"model_id": modelID,
-	}
-	if hfToken != "" {
-		payload["hf_token"] = hfToken
-	}
-	if port != "" {
-		payload["port"] = port
-	}
-
-	jsonData, err := json.Marshal(payload)
+	// Typed payload: omitempty drops the optional fields without building a map
+	jsonData, err := json.Marshal(deployRequest{ModelID: modelID, HFToken: hfToken, Port: port})
 	if err != nil {
 		return nil, fmt.Errorf("failed to marshal request: %w", err)
 	}
 
-	req, err := http.NewRequestWithContext(ctx, http.MethodPost, deployURL, strings.NewReader(string(jsonData)))
+	req, err := http.NewRequestWithContext(ctx, http.MethodPost, deployURL, bytes.NewReader(jsonData))
 	if err != nil {
 		return nil, fmt.Errorf("failed to create request: %w", err)
 	}
@@ -336,6 +328,11 @@ func (c *Client) DeployModel(ctx context.Context, modelID, hfToken, port string)
 	return &deployResp, nil
 }
 
+type spindownRequest struct {
+	ModelID     string `json:"model_id,omitempty"`
+	ContainerID string `json:"container_id,omitempty"`
+}
+
 type SpindownResponse struct {
 	Success bool   `json:"success"`
 	Message string `json:"message"`
@@ -356,20 +353,12 @@ func (c *Client) SpindownModel(ctx context.Context, modelID, containerID string)
 		return nil, fmt.Errorf("invalid URL %q: %w", spindownURL, err)
 	}
 
-	payload := make(map[string]interface{})
-	if modelID != "" {
-		payload["model_id"] = modelID
-	}
-	if containerID != "" {
-		payload["container_id"] = containerID
-	}
-
-	jsonData, err := json.Marshal(payload)
+	jsonData, err := json.Marshal(spindownRequest{ModelID: modelID, ContainerID: containerID})
 	if err != nil {
 		return nil, fmt.Errorf("failed to marshal request: %w", err)
 	}
 
-	req, err := http.NewRequestWithContext(ctx, http.MethodPost, spindownURL, strings.NewReader(string(jsonData)))
+	req, err := http.NewRequestWithContext(ctx, http.MethodPost, spindownURL, bytes.NewReader(jsonData))
 	if err != nil {
 		return nil, fmt.Errorf("failed to create request: %w", err)
 	}
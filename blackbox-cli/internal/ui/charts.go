@@ -80,16 +80,22 @@ func (m *DashboardModel) renderSparklineChart(values []float64, width, height in
 		m.highlightCurrentPoint(grid, points, chartWidth, gridHeight)
 	}
 
-	var b strings.Builder
-	colorStyle := lipgloss.NewStyle().Foreground(color)
+	// Join the grid first and style it with a single Render call; lipgloss still
+	// colors each line, but the style is resolved once per chart instead of per row
+	var rows strings.Builder
+	rows.Grow(gridHeight * (chartWidth*3 + 1))
+	for i := 0; i < gridHeight && i < len(grid); i++ {
+		if i > 0 {
+			rows.WriteByte('\n')
+		}
+		rows.WriteString(string(grid[i]))
+	}
 
+	var b strings.Builder
 	if chartHeight > 0 {
 		b.WriteString(strings.Repeat(" ", chartWidth) + "\n")
 	}
-
-	for i := 0; i < gridHeight && i < len(grid); i++ {
-		b.WriteString(colorStyle.Render(string(grid[i])) + "\n")
-	}
+	b.WriteString(lipgloss.NewStyle().Foreground(color).Render(rows.String()) + "\n")
 
 	return b.String()
 }
@@ -2,6 +2,7 @@ package ui
 
 import (
 	"context"
+	"math"
 	"time"
 
 	"github.com/maxdcmn/blackbox-cli/internal/client"
@@ -13,13 +14,6 @@ import (
 	"github.com/charmbracelet/lipgloss"
 )
 
-type DataPoint struct {
-	Time               time.Time
-	AllocatedVRAMBytes int64
-	UsedKVCacheBytes   int64
-	PrefixCacheHitRate float64
-}
-
 type DashboardModel struct {
 	config                  *config.Config
 	endpoints               []config.Endpoint
@@ -32,7 +26,9 @@ type DashboardModel struct {
 	last                    *model.Snapshot
 	lastErr                 error
 	loaded                  bool
-	history                 []DataPoint
+	vramHistory             chartSeries
+	kvCacheHistory          chartSeries
+	prefixHitRateHistory    chartSeries
 	quitting                bool
 	creating                bool
 	editing                 bool
@@ -71,15 +67,17 @@ type DashboardModel struct {
 	maxBlocksSeen           float64
 	maxFragSeen             float64
 	maxPrefixHitRateSeen    float64
+	pollInterval            time.Duration
+	pollVolatility          float64
 }
 
 func NewDashboard(cfg *config.Config, interval, timeout time.Duration) *DashboardModel {
 	m := &DashboardModel{
-		config:    cfg,
-		endpoints: cfg.Endpoints,
-		interval:  interval,
-		timeout:   timeout,
-		history:   make([]DataPoint, 0, maxHistorySize),
+		config:       cfg,
+		endpoints:    cfg.Endpoints,
+		interval:     interval,
+		timeout:      timeout,
+		pollInterval: basePollInterval,
 	}
 	if len(m.endpoints) > 0 {
 		m.selectEndpoint(0)
@@ -101,13 +99,20 @@ func (m *DashboardModel) selectEndpoint(idx int) {
 			timeout = 10 * time.Second // Final fallback
 		}
 	}
+	if m.client != nil {
+		m.client.Close()
+	}
 	m.client = client.New(ep.BaseURL, ep.Endpoint, timeout)
 	m.loaded = false
 	m.last = nil
 	m.lastErr = nil
-	m.history = make([]DataPoint, 0, maxHistorySize)
+	m.vramHistory.reset()
+	m.kvCacheHistory.reset()
+	m.prefixHitRateHistory.reset()
 	m.metricsScroll = 0
 	m.fetchSequence++
+	m.pollInterval = basePollInterval
+	m.pollVolatility = 0
 }
 
 type tickMsg time.Time
@@ -177,8 +182,47 @@ func startPolling(c *client.Client, endpointID int, fetchSeq int) tea.Cmd {
 	}
 }
 
-func scheduleNextPoll(c *client.Client, endpointID int) tea.Cmd {
-	return tea.Tick(5*time.Second, func(time.Time) tea.Msg {
+const (
+	basePollInterval = 5 * time.Second
+	maxPollInterval  = 20 * time.Second
+	// Smoothed VRAM change per poll, as a fraction of total VRAM, below which the
+	// endpoint counts as idle and polling backs off
+	stableChangeRatio = 0.001
+	volatilityAlpha   = 0.5
+	// Retry spacing while the endpoint keeps failing
+	errorBackoffFactor = 1.3
+	maxErrorInterval   = 60 * time.Second
+)
+
+// adaptPollInterval backs polling off towards maxPollInterval while VRAM is steady
+// and returns to basePollInterval as soon as it starts moving.
+func (m *DashboardModel) adaptPollInterval(prev, s *model.Snapshot) {
+	if prev == nil || s.TotalVRAMBytes <= 0 {
+		m.pollInterval = basePollInterval
+		return
+	}
+	delta := math.Abs(float64(s.AllocatedVRAMBytes-prev.AllocatedVRAMBytes)) +
+		math.Abs(float64(s.UsedKVCacheBytes-prev.UsedKVCacheBytes))
+	change := delta / float64(s.TotalVRAMBytes)
+	m.pollVolatility = volatilityAlpha*change + (1-volatilityAlpha)*m.pollVolatility
+
+	if m.pollVolatility < stableChangeRatio {
+		m.pollInterval = min(m.pollInterval*2, maxPollInterval)
+	} else {
+		m.pollInterval = basePollInterval
+	}
+	utils.Debug("Poll volatility %.5f, next poll in %s", m.pollVolatility, m.pollInterval)
+}
+
+// backOffAfterError stretches the poll interval while requests keep failing so an
+// unreachable endpoint isn't retried at the full polling rate.
+func (m *DashboardModel) backOffAfterError() {
+	m.pollInterval = min(time.Duration(float64(m.pollInterval)*errorBackoffFactor), maxErrorInterval)
+	utils.Debug("Poll failed, next poll in %s", m.pollInterval)
+}
+
+func scheduleNextPoll(c *client.Client, endpointID int, delay time.Duration) tea.Cmd {
+	return tea.Tick(delay, func(time.Time) tea.Msg {
 		ctx, cancel := context.WithTimeout(context.Background(), 20*time.Second)
 		defer cancel()
 		aggSnap, err := c.AggregatedSnapshot(ctx, 5)
@@ -261,13 +305,19 @@ func (m *DashboardModel) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
 		if msg.endpointID != m.selected {
 			return m, nil
 		}
+		recovered := m.lastErr != nil
 		m.loaded = true
 		m.lastErr = msg.err
-		if msg.err == nil && msg.s != nil {
+		if msg.err != nil {
+			m.backOffAfterError()
+		} else if msg.s != nil {
+			if recovered {
+				m.pollInterval = basePollInterval
+			}
+			m.adaptPollInterval(m.last, msg.s)
 			m.updateHistory(msg.s)
 		}
-		// Schedule next poll in 5 seconds
-		return m, scheduleNextPoll(m.client, m.selected)
+		return m, scheduleNextPoll(m.client, m.selected, m.pollInterval)
 
 	case tea.KeyMsg:
 		return m.handleKey(msg)
@@ -278,23 +328,19 @@ func (m *DashboardModel) Update(msg tea.Msg) (tea.Model, tea.Cmd) {
 
 func (m *DashboardModel) updateHistory(s *model.Snapshot) {
 	m.last = s
-	m.history = append(m.history, DataPoint{
-		Time:               time.Now(),
-		AllocatedVRAMBytes: s.AllocatedVRAMBytes,
-		UsedKVCacheBytes:   s.UsedKVCacheBytes,
-		PrefixCacheHitRate: s.PrefixCacheHitRate,
-	})
-	if len(m.history) > maxHistorySize {
-		m.history = m.history[1:]
-	}
+	// History is kept only as one series per chart (already in display units),
+	// extended by one point per poll rather than rebuilt on every render
+	allocatedGB := float64(s.AllocatedVRAMBytes) / gbDivisor
+	usedKVCacheGB := float64(s.UsedKVCacheBytes) / gbDivisor
+	m.vramHistory.push(allocatedGB)
+	m.kvCacheHistory.push(usedKVCacheGB)
+	m.prefixHitRateHistory.push(s.PrefixCacheHitRate)
 
 	// Track max values for scaling charts
-	allocatedGB := float64(s.AllocatedVRAMBytes) / (1024 * 1024 * 1024)
 	if allocatedGB > m.maxVRAMSeen {
 		m.maxVRAMSeen = allocatedGB
 	}
 
-	usedKVCacheGB := float64(s.UsedKVCacheBytes) / (1024 * 1024 * 1024)
 	if usedKVCacheGB > m.maxBlocksSeen {
 		m.maxBlocksSeen = usedKVCacheGB
 	}
@@ -358,6 +404,9 @@ func (m *DashboardModel) handleKey(msg tea.KeyMsg) (tea.Model, tea.Cmd) {
 					m.selectEndpoint(m.selected)
 					return m, startPolling(m.client, m.selected, m.fetchSequence)
 				}
+				if m.client != nil {
+					m.client.Close()
+				}
 				m.client = nil
 			}
 		}
@@ -389,8 +438,7 @@ func (m *DashboardModel) handleKey(msg tea.KeyMsg) (tea.Model, tea.Cmd) {
 			m.modelsErr = nil
 			m.selectedModel = 0
 			m.modelsScroll = 0
-			ep := m.endpoints[m.selected]
-			modelsClient := client.New(ep.BaseURL, ep.Endpoint, m.timeout)
+			modelsClient := m.client.WithTimeout(m.timeout)
 			return m, fetchModels(modelsClient, m.timeout)
 		}
 	case "s":
@@ -404,8 +452,7 @@ func (m *DashboardModel) handleKey(msg tea.KeyMsg) (tea.Model, tea.Cmd) {
 			m.spindownMessage = ""
 			m.spindownSuccess = false
 			m.spindownInFlight = false
-			ep := m.endpoints[m.selected]
-			modelsClient := client.New(ep.BaseURL, ep.Endpoint, m.timeout)
+			modelsClient := m.client.WithTimeout(m.timeout)
 			return m, fetchModels(modelsClient, m.timeout)
 		}
 	case "o":
@@ -414,8 +461,7 @@ func (m *DashboardModel) handleKey(msg tea.KeyMsg) (tea.Model, tea.Cmd) {
 			m.optimizing = true
 			m.optimizeMessage = ""
 			m.optimizeSuccess = false
-			ep := m.endpoints[m.selected]
-			optimizeClient := client.New(ep.BaseURL, ep.Endpoint, m.timeout)
+			optimizeClient := m.client.WithTimeout(m.timeout)
 			return m, optimizeModels(optimizeClient, m.timeout)
 		}
 	}
@@ -511,24 +557,45 @@ Press any key to close`
 	return content
 }
 
-func (m *DashboardModel) getHistory(extractor func(DataPoint) float64) []float64 {
-	values := make([]float64, len(m.history))
-	for i, dp := range m.history {
-		values[i] = extractor(dp)
+// chartSeries holds the last maxHistorySize points of one chart. The points
+// slide forward through a buffer twice that size and are moved back to the
+// front only when it fills up, so pushing never allocates once the buffer
+// exists and the values are always one contiguous slice for the renderer.
+type chartSeries struct {
+	buf  []float64
+	head int
+}
+
+func (c *chartSeries) push(v float64) {
+	if c.buf == nil {
+		c.buf = make([]float64, 0, 2*maxHistorySize)
+	}
+	if len(c.buf) == cap(c.buf) {
+		n := copy(c.buf, c.buf[c.head:])
+		c.buf = c.buf[:n]
+		c.head = 0
+	}
+	c.buf = append(c.buf, v)
+	if len(c.buf)-c.head > maxHistorySize {
+		c.head++
 	}
-	return values
+}
+
+func (c *chartSeries) values() []float64 {
+	return c.buf[c.head:]
+}
+
+func (c *chartSeries) reset() {
+	c.buf = c.buf[:0]
+	c.head = 0
 }
 
 func (m *DashboardModel) getVRAMHistory() []float64 {
-	return m.getHistory(func(dp DataPoint) float64 {
-		return float64(dp.AllocatedVRAMBytes) / (1024 * 1024 * 1024) // Convert to GB
-	})
+	return m.vramHistory.values()
 }
 
 func (m *DashboardModel) getBlocksHistory() []float64 {
-	return m.getHistory(func(dp DataPoint) float64 {
-		return float64(dp.UsedKVCacheBytes) / (1024 * 1024 * 1024) // Convert to GB
-	})
+	return m.kvCacheHistory.values()
 }
 
 func (m *DashboardModel) getFragmentationHistory() []float64 {
@@ -537,7 +604,5 @@ func (m *DashboardModel) getFragmentationHistory() []float64 {
 }
 
 func (m *DashboardModel) getPrefixCacheHitRateHistory() []float64 {
-	return m.getHistory(func(dp DataPoint) float64 {
-		return dp.PrefixCacheHitRate
-	})
+	return m.prefixHitRateHistory.values()
 }
@@ -125,8 +125,7 @@ func (m *DashboardModel) updateDeployMode(msg tea.Msg) (tea.Model, tea.Cmd) {
 				return m, nil
 			}
 			// Deploy the model
-			ep := m.endpoints[m.selected]
-			deployClient := client.New(ep.BaseURL, ep.Endpoint, m.timeout)
+			deployClient := m.client.WithTimeout(m.timeout)
 			return m, deployModel(deployClient, m.timeout, m.deployModelID, m.deployHFToken, m.deployPort)
 		case "tab":
 			m.ensureDeployCursorInBounds()
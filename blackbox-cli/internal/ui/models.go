@@ -358,8 +358,7 @@ func (m *DashboardModel) updateSpindownMode(msg tea.Msg) (tea.Model, tea.Cmd) {
 				m.spindownInFlight = true
 				m.spindownMessage = ""
 				m.spindownSuccess = false
-				ep := m.endpoints[m.selected]
-				spindownClient := client.New(ep.BaseURL, ep.Endpoint, m.timeout)
+				spindownClient := m.client.WithTimeout(m.timeout)
 				return m, spindownModel(spindownClient, m.timeout, modelID)
 			}
 			return m, nil
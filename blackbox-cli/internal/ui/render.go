@@ -20,7 +20,6 @@ func (m *DashboardModel) renderMetricsGrid(width, height int, focused bool) stri
 	b.WriteString(header + "\n")
 
 	var rows []string
-	labelStyle := lipgloss.NewStyle().Foreground(lipgloss.Color(colorText)).Bold(true)
 
 	if m.last == nil || m.lastErr != nil {
 		rows = []string{
@@ -28,9 +27,6 @@ func (m *DashboardModel) renderMetricsGrid(width, height int, focused bool) stri
 			fmt.Sprintf("%s %s", labelStyle.Render("Used KV Cache:"), styleColor(colorMuted).Render("-- GB")),
 		}
 	} else {
-		totalGB := float64(m.last.TotalVRAMBytes) / gbDivisor
-		allocatedGB := float64(m.last.AllocatedVRAMBytes) / gbDivisor
-		usedKVCacheGB := float64(m.last.UsedKVCacheBytes) / gbDivisor
 		allocatedPercent := 0.0
 		if m.last.TotalVRAMBytes > 0 {
 			allocatedPercent = (float64(m.last.AllocatedVRAMBytes) / float64(m.last.TotalVRAMBytes)) * 100.0
@@ -38,12 +34,12 @@ func (m *DashboardModel) renderMetricsGrid(width, height int, focused bool) stri
 
 		rows = []string{
 			fmt.Sprintf("%s %s / %s GB", labelStyle.Render("Allocated VRAM:"),
-				styleColor(colorOrange).Render(fmt.Sprintf("%.2f", allocatedGB)),
-				styleColor(colorItalic).Render(fmt.Sprintf("%.2f", totalGB))),
+				styleColor(colorOrange).Render(formatGB(m.last.AllocatedVRAMBytes)),
+				styleColor(colorItalic).Render(formatGB(m.last.TotalVRAMBytes))),
 			fmt.Sprintf("%s %s", labelStyle.Render("Allocated %:"),
 				styleColor(getPercentColor(allocatedPercent)).Render(fmt.Sprintf("%.1f%%", allocatedPercent))),
 			fmt.Sprintf("%s %s GB", labelStyle.Render("Used KV Cache:"),
-				styleColor(colorGreen).Render(fmt.Sprintf("%.2f", usedKVCacheGB))),
+				styleColor(colorGreen).Render(formatGB(m.last.UsedKVCacheBytes))),
 		}
 
 		// Show per-model breakdown
@@ -51,8 +47,6 @@ func (m *DashboardModel) renderMetricsGrid(width, height int, focused bool) stri
 			rows = append(rows, "")
 			rows = append(rows, labelStyle.Render("Models:"))
 			for _, model := range m.last.Models {
-				modelAllocatedGB := float64(model.AllocatedVRAMBytes) / gbDivisor
-				modelUsedKVCacheGB := float64(model.UsedKVCacheBytes) / gbDivisor
 				modelName := model.ModelID
 				if len(modelName) > 20 {
 					modelName = modelName[:20] + "..."
@@ -62,10 +56,10 @@ func (m *DashboardModel) renderMetricsGrid(width, height int, focused bool) stri
 					styleColor(colorItalic).Render(fmt.Sprintf("(port %d)", model.Port))))
 				rows = append(rows, fmt.Sprintf("%s %s",
 					labelStyle.Render("    Used KV Cache:"),
-					styleColor(colorGreen).Render(fmt.Sprintf("%.2f GB", modelUsedKVCacheGB))))
+					styleColor(colorGreen).Render(formatGB(model.UsedKVCacheBytes)+" GB")))
 				rows = append(rows, fmt.Sprintf("%s %s",
 					labelStyle.Render("    Allocated VRAM:"),
-					styleColor(colorOrange).Render(fmt.Sprintf("%.2f GB", modelAllocatedGB))))
+					styleColor(colorOrange).Render(formatGB(model.AllocatedVRAMBytes)+" GB")))
 			}
 		}
 	}
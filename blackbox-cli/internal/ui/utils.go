@@ -1,12 +1,13 @@
 package ui
 
 import (
+	"strconv"
+
 	"github.com/charmbracelet/lipgloss"
 )
 
 const (
 	maxHistorySize = 50
-	maxThreads     = 10
 	version        = "0.1.0"
 	gbDivisor      = 1024 * 1024 * 1024
 	colorFocused   = "46"
@@ -23,6 +24,28 @@ const (
 	colorRed       = "196"
 )
 
+// formatGBCacheSize bounds the formatGB memo; it is cleared rather than evicted when full.
+const formatGBCacheSize = 256
+
+// formatGBCache memoizes formatGB. Total VRAM and per-model allocations rarely change
+// between polls, so most renders format the same few byte counts again. Views are only
+// rendered from the Bubble Tea event loop, so no lock is needed.
+var formatGBCache = make(map[int64]string, formatGBCacheSize)
+
+// formatGB renders a byte count in GB with two decimals. strconv skips fmt's verb
+// parsing and interface boxing, which adds up over the per-model rows on every render.
+func formatGB(bytes int64) string {
+	if s, ok := formatGBCache[bytes]; ok {
+		return s
+	}
+	s := strconv.FormatFloat(float64(bytes)/gbDivisor, 'f', 2, 64)
+	if len(formatGBCache) >= formatGBCacheSize {
+		formatGBCache = make(map[int64]string, formatGBCacheSize)
+	}
+	formatGBCache[bytes] = s
+	return s
+}
+
 func maxFloat(a, b float64) float64 {
 	if a > b {
 		return a
@@ -90,7 +113,23 @@ func truncateString(s string, maxLen int) string {
 	return s[:maxLen-3] + "..."
 }
 
+// colorStyles holds a foreground style per palette color, built once so render loops
+// reuse it instead of constructing a new style for every styled cell.
+var colorStyles = func() map[string]lipgloss.Style {
+	styles := make(map[string]lipgloss.Style)
+	for _, color := range []string{
+		colorFocused, colorUnfocused, colorText, colorMuted, colorDim, colorItalic,
+		colorBg, colorOrange, colorYellow, colorCyan, colorGreen, colorRed,
+	} {
+		styles[color] = lipgloss.NewStyle().Foreground(lipgloss.Color(color))
+	}
+	return styles
+}()
+
 func styleColor(color string) lipgloss.Style {
+	if style, ok := colorStyles[color]; ok {
+		return style
+	}
 	return lipgloss.NewStyle().Foreground(lipgloss.Color(color))
 }
 
@@ -134,6 +173,10 @@ var (
 			Background(lipgloss.Color(colorBg)).
 			Foreground(lipgloss.Color(colorMuted))
 
+	labelStyle = lipgloss.NewStyle().
+			Foreground(lipgloss.Color(colorText)).
+			Bold(true)
+
 	fieldStyle = lipgloss.NewStyle().
 			Foreground(lipgloss.Color(colorItalic))
 
@@ -1,13 +1,22 @@
 package utils
 
 import (
+	"bufio"
 	"fmt"
 	"os"
+	"sync"
 	"time"
 )
 
+// Log file writes are buffered and flushed on warnings/errors, at most every
+// logFlushInterval otherwise, and on CloseLogger.
+const logFlushInterval = time.Second
+
 var debugEnabled = false
 var logFile *os.File
+var logWriter *bufio.Writer
+var logMu sync.Mutex
+var lastFlush time.Time
 
 func InitLogger(debug bool, logPath string) error {
 	debugEnabled = debug
@@ -17,12 +26,17 @@ func InitLogger(debug bool, logPath string) error {
 		if err != nil {
 			return err
 		}
+		logWriter = bufio.NewWriter(logFile)
+		lastFlush = time.Now()
 	}
 	return nil
 }
 
 func CloseLogger() {
+	logMu.Lock()
+	defer logMu.Unlock()
 	if logFile != nil {
+		logWriter.Flush()
 		logFile.Close()
 	}
 }
@@ -32,17 +46,30 @@ func log(level, msg string, args ...interface{}) {
 		return
 	}
 	
-	timestamp := time.Now().Format("2006-01-02 15:04:05.000")
+	now := time.Now()
+	timestamp := now.Format("2006-01-02 15:04:05.000")
 	formatted := fmt.Sprintf(msg, args...)
 	line := fmt.Sprintf("[%s] %s: %s\n", timestamp, level, formatted)
 	
 	if logFile != nil {
-		logFile.WriteString(line)
+		logMu.Lock()
+		logWriter.WriteString(line)
+		if level == "WARN" || level == "ERROR" || now.Sub(lastFlush) >= logFlushInterval {
+			logWriter.Flush()
+			lastFlush = now
+		}
+		logMu.Unlock()
 	} else {
 		fmt.Fprintf(os.Stderr, line)
 	}
 }
 
+// DebugEnabled reports whether debug lines are logged, for callers that would
+// otherwise build or loop over values only to have them dropped.
+func DebugEnabled() bool {
+	return debugEnabled
+}
+
 func Debug(msg string, args ...interface{}) {
 	log("DEBUG", msg, args...)
 }
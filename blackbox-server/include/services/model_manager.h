@@ -4,26 +4,28 @@
 #include <vector>
 #include <map>
 #include <deque>
+#include <utility>
 
 struct DeployedModel {
     std::string model_id;
     std::string container_id;
     std::string container_name;
-    int port;
-    bool running;
-    double configured_max_gpu_utilization;
-    double avg_vram_usage_percent;
-    double peak_vram_usage_percent;
+    int port = 0;
+    bool running = false;
+    double configured_max_gpu_utilization = 0.0;
+    double avg_vram_usage_percent = 0.0;
+    double peak_vram_usage_percent = 0.0;
     std::string gpu_type;
-    unsigned int pid;
+    unsigned int pid = 0;
 };
 
 struct ModelMetrics {
     std::deque<double> vram_samples;
-    double peak_usage;
-    double configured_max_utilization;
+    double vram_sample_sum = 0.0;  // Running sum of vram_samples, kept in step with the deque
+    double peak_usage = 0.0;
+    double configured_max_utilization = 0.0;
     std::string gpu_type;
-    unsigned int pid;
+    unsigned int pid = 0;
 };
 
 struct ModelListResponse {
@@ -48,6 +50,7 @@ int getNextAvailablePort(int preferred_port = 0);
 std::string getContainerName(const std::string& model_id);
 bool spindownModel(const std::string& model_id_or_container);
 void updateModelVRAMUsage(const std::string& container_name, double vram_percent);
+void updateModelVRAMUsage(const std::vector<std::pair<std::string, double>>& samples);
 void registerModelDeployment(const std::string& model_id, const std::string& container_name, 
                              double configured_max_gpu_utilization, const std::string& gpu_type, unsigned int pid);
 void unregisterModel(const std::string& container_name);
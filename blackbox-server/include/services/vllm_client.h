@@ -6,14 +6,14 @@
 
 struct ModelBlockData {
     std::string model_id;
-    int port;
-    unsigned int num_gpu_blocks;
-    unsigned long long block_size;
-    double kv_cache_usage_perc;
-    double prefix_cache_hit_rate;
-    unsigned int num_requests_running;
-    unsigned int num_requests_waiting;
-    bool available;
+    int port = 0;
+    unsigned int num_gpu_blocks = 0;
+    unsigned long long block_size = 0;
+    double kv_cache_usage_perc = 0.0;
+    double prefix_cache_hit_rate = 0.0;
+    unsigned int num_requests_running = 0;
+    unsigned int num_requests_waiting = 0;
+    bool available = false;
 };
 
 VLLMBlockData fetchVLLMBlockData();
@@ -1,21 +1,6 @@
 #pragma once
 
-#include <string>
-#include <map>
-#include <deque>
-
-struct ProcessVRAM {
-    unsigned int pid;
-    unsigned long long used_bytes;
-    unsigned long long total_bytes;
-    double usage_percent;
-};
-
-std::map<std::string, ProcessVRAM> getProcessVRAMUsage();
-double getModelVRAMUsagePercent(const std::string& container_name, unsigned int pid);
-
-
-
-
-
+#include "vram_types.h"
+#include <unordered_map>
 
+std::unordered_map<unsigned int, double> getPidVRAMUsagePercents(const DetailedVRAMInfo& info);
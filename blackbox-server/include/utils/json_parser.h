@@ -1,8 +1,12 @@
 #pragma once
 
+#include <nlohmann/json.hpp>
 #include <string>
 
+nlohmann::json parseJSONObject(const std::string& json);
+std::string parseJSONField(const nlohmann::json& j, const std::string& field);
 std::string parseJSONField(const std::string& json, const std::string& field);
+int parseJSONInt(const nlohmann::json& j, const std::string& field, int default_val = 0);
 int parseJSONInt(const std::string& json, const std::string& field, int default_val = 0);
 
 
@@ -32,10 +32,12 @@ private:
     static std::string colorize(LogLevel level, const std::string& text);
 };
 
-// Convenience macros
-#define LOG_DEBUG(msg) Logger::debug(msg)
-#define LOG_INFO(msg) Logger::info(msg)
-#define LOG_WARN(msg) Logger::warn(msg)
-#define LOG_ERROR(msg) Logger::error(msg)
+// Convenience macros. The level is checked before the message expression is
+// evaluated, so filtered-out lines don't pay for building their strings.
+#define LOG_AT(level, msg) do { if ((level) >= Logger::getLevel()) Logger::log(level, msg); } while (0)
+#define LOG_DEBUG(msg) LOG_AT(LogLevel::DEBUG, msg)
+#define LOG_INFO(msg) LOG_AT(LogLevel::INFO, msg)
+#define LOG_WARN(msg) LOG_AT(LogLevel::WARN, msg)
+#define LOG_ERROR(msg) LOG_AT(LogLevel::ERROR, msg)
 
 
@@ -4,17 +4,6 @@
 #include <vector>
 #include <map>
 
-struct MemoryBlock {
-    unsigned long long address;
-    unsigned long long size;
-    std::string type;
-    int block_id;
-    bool allocated;
-    bool utilized;
-    std::string model_id;  // Model identifier (e.g., "TinyLlama")
-    int port;              // Port the model is running on
-};
-
 struct ProcessMemory {
     unsigned int pid;
     std::string name;
@@ -22,12 +11,6 @@ struct ProcessMemory {
     unsigned long long reserved_bytes;
 };
 
-struct ThreadInfo {
-    int thread_id;
-    unsigned long long allocated_bytes;
-    std::string state;
-};
-
 struct NsightMetrics {
     unsigned long long atomic_operations;
     unsigned long long threads_per_block;
@@ -41,9 +24,9 @@ struct NsightMetrics {
 
 struct ModelVRAMInfo {
     std::string model_id;
-    int port;
-    unsigned long long allocated_vram_bytes;  // VRAM allocated for this model
-    unsigned long long used_kv_cache_bytes;   // Actual used KV cache bytes for this model
+    int port = 0;
+    unsigned long long allocated_vram_bytes = 0;  // VRAM allocated for this model
+    unsigned long long used_kv_cache_bytes = 0;   // Actual used KV cache bytes for this model
 };
 
 struct DetailedVRAMInfo {
@@ -51,9 +34,7 @@ struct DetailedVRAMInfo {
     unsigned long long used;
     unsigned long long free;
     unsigned long long reserved;
-    std::vector<MemoryBlock> blocks;
     std::vector<ProcessMemory> processes;
-    std::vector<ThreadInfo> threads;
     unsigned int allocated_blocks;
     unsigned int utilized_blocks;
     unsigned int free_blocks;
@@ -62,6 +43,8 @@ struct DetailedVRAMInfo {
     std::map<unsigned int, NsightMetrics> nsight_metrics;
     unsigned long long used_kv_cache_bytes;  // Total actual used KV cache bytes (sum across all models)
     double prefix_cache_hit_rate;            // Prefix cache hit rate (0.0-100.0)
+    unsigned int num_requests_running;       // Running requests summed over available models
+    unsigned int num_requests_waiting;       // Waiting requests summed over available models
     std::vector<ModelVRAMInfo> models;        // Per-model breakdown
 };
 
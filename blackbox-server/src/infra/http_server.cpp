@@ -8,107 +8,249 @@
 #include "services/optimization_service.h"
 #include "services/model_manager.h"
 #include "services/vram_tracker.h"
+#include "utils/env_utils.h"
 #include <boost/beast/core.hpp>
 #include <boost/beast/http.hpp>
 #include <boost/asio/connect.hpp>
+#include <boost/asio/thread_pool.hpp>
+#include <boost/asio/post.hpp>
 #include <iostream>
 #include <chrono>
 #include <thread>
-#include <sstream>
 #include <string>
 #include <regex>
+#include <map>
+#include <mutex>
+#include <memory>
+#include <vector>
+#include <condition_variable>
+#include <algorithm>
+#include <absl/strings/str_cat.h>
+
+// Dashboards poll /vram/aggregated with the same window every few seconds, and the
+// sampler only adds a point every 500ms, so the serialized body is reused per window
+// for that long. Each window has its own lock, held while computing so concurrent
+// misses share one; a cold sampler can make that take a full window, and requests
+// for other windows must not queue behind it.
+static const auto AGGREGATED_CACHE_TTL = std::chrono::milliseconds(500);
+
+struct CachedResponse {
+    std::string json;
+    std::chrono::steady_clock::time_point time;
+};
+
+struct CachedAggregatedWindow {
+    std::mutex mutex;
+    CachedResponse response;
+};
+
+static std::mutex aggregated_cache_mutex;  // Guards the map only; windows are clamped to 1-60
+static std::map<unsigned int, CachedAggregatedWindow> aggregated_cache;
+
+static std::string getAggregatedResponse(unsigned int window_seconds) {
+    CachedAggregatedWindow* entry = nullptr;
+    {
+        std::lock_guard<std::mutex> lock(aggregated_cache_mutex);
+        entry = &aggregated_cache[window_seconds];
+    }
+    
+    std::lock_guard<std::mutex> lock(entry->mutex);
+    auto now = std::chrono::steady_clock::now();
+    if (!entry->response.json.empty() && now - entry->response.time < AGGREGATED_CACHE_TTL) {
+        return entry->response.json;
+    }
+    
+    LOG_DEBUG("Collecting aggregated metrics for " + std::to_string(window_seconds) + " seconds");
+    entry->response.json = createAggregatedResponse(collectAggregatedMetrics(window_seconds));
+    entry->response.time = std::chrono::steady_clock::now();
+    return entry->response.json;
+}
+
+// /vram is polled by the dashboard and scripts; a snapshot costs an NVML pass, a docker
+// listing and a metrics scrape per model, so concurrent or rapid polls within one stream
+// interval share the same serialized body.
+static const auto DETAILED_CACHE_TTL = std::chrono::milliseconds(500);
+
+static std::mutex detailed_cache_mutex;
+static CachedResponse detailed_cache;
+
+static std::string getDetailedResponse() {
+    std::lock_guard<std::mutex> lock(detailed_cache_mutex);
+    auto now = std::chrono::steady_clock::now();
+    if (!detailed_cache.json.empty() && now - detailed_cache.time < DETAILED_CACHE_TTL) {
+        return detailed_cache.json;
+    }
+    
+    LOG_DEBUG("Fetching VRAM info");
+    detailed_cache.json = createDetailedResponse(getDetailedVRAMUsage());
+    detailed_cache.time = std::chrono::steady_clock::now();
+    return detailed_cache.json;
+}
+
+// Every /vram/stream subscriber is served by one broadcaster thread: each tick collects,
+// records the per-model VRAM samples and serializes once, then writes the same event to
+// all subscribers concurrently, instead of a thread per client repeating that work.
+// Each subscriber gets one long-lived chunked response, and every event is one chunk.
+static const auto STREAM_INTERVAL = std::chrono::milliseconds(500);
+static const auto STREAM_WRITE_TIMEOUT = std::chrono::seconds(2);  // Drop clients that stop reading
+static const size_t MAX_STREAM_CLIENTS = 64;  // Every tick writes to each subscriber, so cap them
+
+static net::io_context stream_ioc;
+static std::mutex stream_clients_mutex;
+static std::condition_variable stream_clients_cv;
+static std::vector<std::unique_ptr<beast::tcp_stream>> stream_clients;
+static size_t stream_client_count = 0;  // Subscribers including those mid-tick; guarded by stream_clients_mutex
+
+static std::string buildStreamEvent() {
+    DetailedVRAMInfo info = getDetailedVRAMUsage();
+    
+    auto models = listDeployedModels();
+    // Index the processes by pid once instead of scanning them again for every model
+    auto pid_percents = getPidVRAMUsagePercents(info);
+    std::vector<std::pair<std::string, double>> vram_samples;
+    for (const auto& model : models) {
+        if (model.running && model.pid > 0) {
+            auto it = pid_percents.find(model.pid);
+            double vram_percent = it != pid_percents.end() ? it->second : 0.0;
+            vram_samples.emplace_back(model.container_name, vram_percent);
+        }
+    }
+    updateModelVRAMUsage(vram_samples);
+    
+    // Frame the event straight into the body: one sized allocation, no stream copies
+    return absl::StrCat("data: ", createDetailedResponse(info), "\n\n");
+}
+
+static void streamBroadcastLoop() {
+    // Ticks are scheduled on a steady_clock deadline so the time spent collecting
+    // and writing each event doesn't stretch the interval between events
+    auto next_tick = std::chrono::steady_clock::now();
+    while (true) {
+        std::vector<std::unique_ptr<beast::tcp_stream>> clients;
+        {
+            std::unique_lock<std::mutex> lock(stream_clients_mutex);
+            if (stream_clients.empty()) {
+                stream_clients_cv.wait(lock, [] { return !stream_clients.empty(); });
+                next_tick = std::chrono::steady_clock::now();
+            }
+            clients.swap(stream_clients);
+        }
+        
+        std::string event;
+        try {
+            event = buildStreamEvent();
+        } catch (const std::exception& e) {
+            LOG_ERROR("Error building stream event: " + std::string(e.what()));
+        }
+        
+        size_t dropped = 0;
+        if (!event.empty()) {
+            // The chunk is framed once per tick and the same buffers go to every subscriber
+            auto frame = http::make_chunk(net::buffer(event));
+            std::vector<bool> failed(clients.size(), false);
+            for (size_t i = 0; i < clients.size(); ++i) {
+                clients[i]->expires_after(STREAM_WRITE_TIMEOUT);
+                net::async_write(*clients[i], frame, [&failed, i](beast::error_code ec, std::size_t) {
+                    if (ec) failed[i] = true;
+                });
+            }
+            stream_ioc.restart();
+            stream_ioc.run();
+            
+            size_t kept = 0;
+            for (size_t i = 0; i < clients.size(); ++i) {
+                if (failed[i]) {
+                    LOG_DEBUG("Stream client disconnected");
+                    beast::error_code ec;
+                    clients[i]->socket().shutdown(tcp::socket::shutdown_both, ec);
+                    clients[i]->close();
+                } else {
+                    clients[kept++] = std::move(clients[i]);
+                }
+            }
+            dropped = clients.size() - kept;
+            clients.resize(kept);
+            LOG_DEBUG("Stream event (" + std::to_string(event.size()) + " bytes) sent to " +
+                      std::to_string(kept) + " client(s)");
+        }
+        
+        {
+            // Clients that subscribed while this tick was running are already in the list
+            std::lock_guard<std::mutex> lock(stream_clients_mutex);
+            for (auto& client : clients) {
+                stream_clients.push_back(std::move(client));
+            }
+            stream_client_count -= dropped;
+        }
+        
+        next_tick += STREAM_INTERVAL;
+        auto now = std::chrono::steady_clock::now();
+        if (next_tick < now) {
+            next_tick = now;
+        }
+        std::this_thread::sleep_until(next_tick);
+    }
+}
 
 void handleStreamingRequest(tcp::socket& socket) {
-    LOG_DEBUG("handleStreamingRequest: Entering function");
-    try {
-        LOG_DEBUG("handleStreamingRequest: Creating response");
+    static std::once_flag broadcaster_started;
+    
+    // Claim a subscriber slot up front so a burst of reconnecting clients can't grow
+    // the broadcast list without bound
+    bool full = false;
+    {
+        std::lock_guard<std::mutex> lock(stream_clients_mutex);
+        full = stream_client_count >= MAX_STREAM_CLIENTS;
+        if (!full) {
+            ++stream_client_count;
+        }
+    }
+    if (full) {
+        LOG_WARN("Rejecting stream client: " + std::to_string(MAX_STREAM_CLIENTS) + " subscribers already connected");
         http::response<http::string_body> res;
+        res.result(http::status::service_unavailable);
+        res.set(http::field::content_type, "text/plain");
+        res.body() = "Too many stream clients";
+        res.prepare_payload();
+        beast::error_code ec;
+        http::write(socket, res, ec);
+        return;
+    }
+    
+    try {
+        // Only the header goes out here; events follow as chunks of this same response
+        http::response<http::empty_body> res;
         res.result(http::status::ok);
         res.set(http::field::content_type, "text/event-stream");
         res.set(http::field::cache_control, "no-cache");
         res.set(http::field::connection, "keep-alive");
-        res.body() = "";
-        res.prepare_payload();
+        res.chunked(true);
         
         LOG_DEBUG("handleStreamingRequest: Sending SSE headers");
-        http::write(socket, res);
-        LOG_DEBUG("handleStreamingRequest: SSE headers sent, starting stream loop");
+        http::response_serializer<http::empty_body> serializer{res};
+        http::write_header(socket, serializer);
         
-        int iteration = 0;
-        while (true) {
-            iteration++;
-            LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": Starting");
-            try {
-                LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": Getting VRAM info");
-                DetailedVRAMInfo info = getDetailedVRAMUsage();
-                LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": Got VRAM info, getting models");
-                
-                auto models = listDeployedModels();
-                for (const auto& model : models) {
-                    if (model.running && model.pid > 0) {
-                        double vram_percent = getModelVRAMUsagePercent(model.container_name, model.pid);
-                        updateModelVRAMUsage(model.container_name, vram_percent);
-                    }
-                }
-                
-                LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": Creating JSON response");
-                std::string json = createDetailedResponse(info);
-                LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": JSON created (" + std::to_string(json.length()) + " bytes)");
-                
-                std::ostringstream event;
-                event << "data: " << json << "\n\n";
-                
-                http::response<http::string_body> chunk;
-                chunk.result(http::status::ok);
-                chunk.set(http::field::content_type, "text/event-stream");
-                chunk.body() = event.str();
-                chunk.prepare_payload();
-                
-                LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": Writing SSE chunk (" + std::to_string(chunk.body().length()) + " bytes)");
-                http::write(socket, chunk);
-                LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": SSE chunk written, sleeping");
-                
-                std::this_thread::sleep_for(std::chrono::milliseconds(500));
-            } catch (const boost::system::system_error& e) {
-                auto ec = e.code();
-                LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": Caught system_error: " + std::string(e.what()) + " (code: " + std::to_string(ec.value()) + ")");
-                if (ec == boost::asio::error::broken_pipe || 
-                    ec == boost::asio::error::connection_reset ||
-                    ec == boost::asio::error::eof ||
-                    ec == boost::beast::http::error::end_of_stream ||
-                    ec == boost::asio::error::operation_aborted ||
-                    ec.category() == boost::asio::error::get_system_category()) {
-                    LOG_DEBUG("Stream connection closed by client at iteration " + std::to_string(iteration));
-                    break;
-                }
-                LOG_ERROR("Unexpected system error in stream iteration " + std::to_string(iteration) + ": " + std::string(e.what()));
-                break;
-            } catch (const std::exception& e) {
-                std::string err_msg = e.what();
-                LOG_DEBUG("Stream iteration " + std::to_string(iteration) + ": Caught exception: " + err_msg);
-                if (err_msg.find("end of stream") != std::string::npos ||
-                    err_msg.find("end_of_stream") != std::string::npos ||
-                    err_msg.find("Broken pipe") != std::string::npos ||
-                    err_msg.find("Connection reset") != std::string::npos) {
-                    LOG_DEBUG("Stream connection closed at iteration " + std::to_string(iteration));
-                    break;
-                }
-                LOG_ERROR("Error in stream iteration " + std::to_string(iteration) + ": " + err_msg);
-                break;
-            } catch (...) {
-                LOG_ERROR("Stream iteration " + std::to_string(iteration) + ": Caught unknown exception");
-                break;
-            }
-        }
-        LOG_DEBUG("Stream loop ended after " + std::to_string(iteration) + " iterations");
+        // Hand the connection over to the broadcaster's io_context
+        auto client = std::make_unique<beast::tcp_stream>(stream_ioc);
+        auto protocol = socket.local_endpoint().protocol();
+        client->socket().assign(protocol, socket.release());
+        
+        std::call_once(broadcaster_started, [] {
+            std::thread(streamBroadcastLoop).detach();
+            LOG_INFO("Started stream broadcaster thread (every 500ms)");
+        });
+        
+        std::lock_guard<std::mutex> lock(stream_clients_mutex);
+        stream_clients.push_back(std::move(client));
+        stream_clients_cv.notify_one();
+        LOG_DEBUG("handleStreamingRequest: Client subscribed (" + std::to_string(stream_clients.size()) + " waiting for next tick)");
     } catch (const std::exception& e) {
-        LOG_ERROR("Fatal error in handleStreamingRequest: " + std::string(e.what()));
-    } catch (...) {
-        LOG_ERROR("Unknown fatal error in handleStreamingRequest");
+        LOG_DEBUG("Stream client could not be subscribed: " + std::string(e.what()));
+        std::lock_guard<std::mutex> lock(stream_clients_mutex);
+        --stream_client_count;
     }
 }
 
-
 void handleRequest(http::request<http::string_body>& req, tcp::socket& socket) {
     std::string target = std::string(req.target());
     std::string method = std::string(to_string(req.method()));
@@ -125,27 +267,28 @@ void handleRequest(http::request<http::string_body>& req, tcp::socket& socket) {
     if (req.method() == http::verb::get) {
         if (target == "/vram" || target == "/vram/stream") {
             if (target == "/vram/stream") {
+                // Subscribes the connection to the shared broadcaster and returns,
+                // so streams don't pin a request worker
                 LOG_DEBUG("Starting streaming request from " + client_ip);
                 handleStreamingRequest(socket);
-                LOG_DEBUG("Streaming request ended from " + client_ip);
                 return;
             }
             
-            LOG_DEBUG("Fetching VRAM info");
-            DetailedVRAMInfo info = getDetailedVRAMUsage();
-            std::string json = createDetailedResponse(info);
+            std::string json = getDetailedResponse();
             
             http::response<http::string_body> res;
             res.version(req.version());
             res.keep_alive(req.keep_alive());
             res.result(http::status::ok);
             res.set(http::field::content_type, "application/json");
-            res.body() = json;
+            // The serializer already built the whole body in one reserved string, so hand it
+            // over rather than copying it again into the response
+            res.body() = std::move(json);
             res.prepare_payload();
             
             try {
                 http::write(socket, res);
-                LOG_DEBUG("VRAM response sent (" + std::to_string(json.length()) + " bytes)");
+                LOG_DEBUG("VRAM response sent (" + std::to_string(res.body().size()) + " bytes)");
             } catch (const boost::system::system_error& e) {
                 auto ec = e.code();
                 if (ec == boost::asio::error::broken_pipe || 
@@ -159,7 +302,8 @@ void handleRequest(http::request<http::string_body>& req, tcp::socket& socket) {
             return;
         } else if (target.find("/vram/aggregated") == 0) {
             unsigned int window_seconds = 5;
-            std::regex window_regex(R"(window=(\d+))");
+            // Compiled once; building a std::regex per request dominated query parsing
+            static const std::regex window_regex(R"(window=(\d+))");
             std::smatch match;
             std::string query = std::string(req.target());
             size_t query_pos = query.find('?');
@@ -176,21 +320,19 @@ void handleRequest(http::request<http::string_body>& req, tcp::socket& socket) {
                 }
             }
             
-            LOG_DEBUG("Collecting aggregated metrics for " + std::to_string(window_seconds) + " seconds");
-            AggregatedVRAMInfo info = collectAggregatedMetrics(window_seconds);
-            std::string json = createAggregatedResponse(info);
+            std::string json = getAggregatedResponse(window_seconds);
             
             http::response<http::string_body> res;
             res.version(req.version());
             res.keep_alive(req.keep_alive());
             res.result(http::status::ok);
             res.set(http::field::content_type, "application/json");
-            res.body() = json;
+            res.body() = std::move(json);
             res.prepare_payload();
             
             try {
                 http::write(socket, res);
-                LOG_DEBUG("Aggregated VRAM response sent (" + std::to_string(json.length()) + " bytes)");
+                LOG_DEBUG("Aggregated VRAM response sent (" + std::to_string(res.body().size()) + " bytes)");
             } catch (const boost::system::system_error& e) {
                 auto ec = e.code();
                 if (ec == boost::asio::error::broken_pipe || 
@@ -208,6 +350,10 @@ void handleRequest(http::request<http::string_body>& req, tcp::socket& socket) {
             return;
         }
     } else if (req.method() == http::verb::post) {
+        // Deploy, spindown and optimize check and change the set of running containers
+        // (port assignment, model limit), so they still run one at a time
+        static std::mutex model_admin_mutex;
+        std::lock_guard<std::mutex> admin_lock(model_admin_mutex);
         if (target == "/deploy") {
             LOG_INFO("Deploy request received from " + client_ip);
             LOG_DEBUG("Request body: " + req.body().substr(0, 200) + (req.body().length() > 200 ? "..." : ""));
@@ -248,39 +394,120 @@ void handleRequest(http::request<http::string_body>& req, tcp::socket& socket) {
     }
 }
 
+// Connections are kept alive so pollers reuse one socket, but waiting for the next
+// request happens asynchronously on connection_ioc, served by a single thread. An idle
+// connection therefore holds no worker: a fully read request is handed to the worker
+// pool, and the connection goes back to waiting once the response is written.
+static const auto KEEP_ALIVE_TIMEOUT = std::chrono::seconds(5);
+
+static net::io_context connection_ioc;
+
+struct Connection {
+    beast::tcp_stream stream;
+    beast::flat_buffer buffer;
+    http::request<http::string_body> req;
+    
+    explicit Connection(tcp::socket&& socket) : stream(std::move(socket)) {}
+};
+
+static void readRequest(std::shared_ptr<Connection> conn, net::thread_pool& pool);
+
+// Runs on a worker; returns whether the connection should wait for another request
+static bool serveRequest(Connection& conn) {
+    try {
+        bool keep_alive = conn.req.keep_alive();
+        handleRequest(conn.req, conn.stream.socket());
+        // Streaming requests hand the socket over to the broadcaster
+        if (keep_alive && conn.stream.socket().is_open()) {
+            return true;
+        }
+        
+        if (conn.stream.socket().is_open()) {
+            beast::error_code ec;
+            conn.stream.socket().shutdown(tcp::socket::shutdown_send, ec);
+        }
+    } catch (const boost::system::system_error& e) {
+        auto ec = e.code();
+        if (ec == boost::asio::error::broken_pipe || 
+            ec == boost::asio::error::connection_reset ||
+            ec == boost::asio::error::eof ||
+            ec == boost::beast::http::error::end_of_stream ||
+            ec == boost::asio::error::operation_aborted ||
+            ec.category() == boost::asio::error::get_system_category()) {
+            return false;
+        }
+        std::cerr << "Unexpected connection error: " << e.what() << std::endl;
+    } catch (const std::exception& e) {
+        std::string err_msg = e.what();
+        if (err_msg.find("end of stream") != std::string::npos ||
+            err_msg.find("end_of_stream") != std::string::npos ||
+            err_msg.find("Broken pipe") != std::string::npos ||
+            err_msg.find("Connection reset") != std::string::npos ||
+            err_msg.find("Connection refused") != std::string::npos) {
+            return false;
+        }
+        std::cerr << "Error handling request: " << e.what() << std::endl;
+    } catch (...) {
+    }
+    return false;
+}
+
+static void readRequest(std::shared_ptr<Connection> conn, net::thread_pool& pool) {
+    conn->req = {};
+    conn->stream.expires_after(KEEP_ALIVE_TIMEOUT);
+    http::async_read(conn->stream, conn->buffer, conn->req,
+                     [conn, &pool](beast::error_code ec, std::size_t) {
+        if (ec) {
+            return;  // Closed, idle past the timeout, or not HTTP; the socket closes with conn
+        }
+        conn->stream.expires_never();
+        net::post(pool, [conn, &pool] {
+            if (serveRequest(*conn)) {
+                net::post(connection_ioc, [conn, &pool] { readRequest(conn, pool); });
+            }
+        });
+    });
+}
+
+static unsigned int getServerWorkers() {
+    unsigned int cores = std::max(1u, std::thread::hardware_concurrency());
+    try {
+        int workers = std::stoi(getEnvValue("SERVER_WORKERS", std::to_string(cores)));
+        return workers > 0 ? static_cast<unsigned int>(workers) : cores;
+    } catch (...) {
+        return cores;
+    }
+}
+
 void acceptConnections(tcp::acceptor& acceptor) {
+    // Requests are served by a pool of workers (one per core by default) so a slow
+    // collection or deploy no longer holds up every other client behind it
+    unsigned int workers = getServerWorkers();
+    net::thread_pool pool(workers);
+    LOG_INFO("Serving requests with " + std::to_string(workers) + " worker thread(s)");
+    
+    // Keep connection_ioc running between connections
+    static auto connection_work = net::make_work_guard(connection_ioc);
+    std::thread([] {
+        while (true) {
+            try {
+                connection_ioc.run();
+                return;
+            } catch (const std::exception& e) {
+                LOG_ERROR("Connection reader error: " + std::string(e.what()));
+            }
+        }
+    }).detach();
+    
     while (true) {
         try {
-            tcp::socket socket(acceptor.get_executor());
+            // Accepted straight onto connection_ioc, where its requests are read
+            tcp::socket socket(connection_ioc);
             acceptor.accept(socket);
-            
-            beast::flat_buffer buffer;
-            http::request<http::string_body> req;
-            http::read(socket, buffer, req);
-            handleRequest(req, socket);
-        } catch (const boost::system::system_error& e) {
-            auto ec = e.code();
-            if (ec == boost::asio::error::broken_pipe || 
-                ec == boost::asio::error::connection_reset ||
-                ec == boost::asio::error::eof ||
-                ec == boost::beast::http::error::end_of_stream ||
-                ec == boost::asio::error::operation_aborted ||
-                ec.category() == boost::asio::error::get_system_category()) {
-                continue;
-            }
-            std::cerr << "Unexpected connection error: " << e.what() << std::endl;
+            auto conn = std::make_shared<Connection>(std::move(socket));
+            net::post(connection_ioc, [conn, &pool] { readRequest(conn, pool); });
         } catch (const std::exception& e) {
-            std::string err_msg = e.what();
-            if (err_msg.find("end of stream") != std::string::npos ||
-                err_msg.find("end_of_stream") != std::string::npos ||
-                err_msg.find("Broken pipe") != std::string::npos ||
-                err_msg.find("Connection reset") != std::string::npos ||
-                err_msg.find("Connection refused") != std::string::npos) {
-                continue;
-            }
-            std::cerr << "Error handling request: " << e.what() << std::endl;
-        } catch (...) {
-            continue;
+            LOG_DEBUG("Error accepting connection: " + std::string(e.what()));
         }
     }
 }
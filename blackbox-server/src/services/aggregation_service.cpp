@@ -1,122 +1,245 @@
 #include "services/aggregation_service.h"
 #include "services/nvml_utils.h"
-#include "services/vllm_client.h"
 #include "services/model_manager.h"
+#include "utils/logger.h"
 #include <algorithm>
 #include <cmath>
 #include <deque>
 #include <thread>
 #include <chrono>
+#include <mutex>
+#include <condition_variable>
+#include <utility>
 
-static double calculatePercentile(const std::vector<double>& sorted_values, double percentile) {
-    if (sorted_values.empty()) return 0.0;
-    if (sorted_values.size() == 1) return sorted_values[0];
-    
-    double index = percentile * (sorted_values.size() - 1);
+// Selects the interpolated percentile in place with nth_element instead of sorting.
+// Everything before `first` must already be <= everything from it onward (true after
+// an earlier call for a lower percentile), so successive calls only partition the tail.
+static double selectPercentile(std::vector<double>& values, size_t first, double percentile, size_t& lower_out) {
+    double index = percentile * (values.size() - 1);
     size_t lower = static_cast<size_t>(std::floor(index));
     size_t upper = static_cast<size_t>(std::ceil(index));
+    lower_out = lower;
     
+    auto lower_it = values.begin() + lower;
+    std::nth_element(values.begin() + first, lower_it, values.end());
     if (lower == upper) {
-        return sorted_values[lower];
+        return *lower_it;
     }
     
+    // After partitioning, the next order statistic is the smallest element past lower
+    double upper_value = *std::min_element(lower_it + 1, values.end());
     double weight = index - lower;
-    return sorted_values[lower] * (1.0 - weight) + sorted_values[upper] * weight;
+    return *lower_it * (1.0 - weight) + upper_value * weight;
 }
 
-static AggregatedStats calculateStats(const std::vector<double>& values) {
+// Takes the window by value: it is a scratch copy the percentile selection reorders
+static AggregatedStats calculateStats(std::vector<double> values) {
     AggregatedStats stats{0.0, 0.0, 0.0, 0.0, 0.0, 0};
     
     if (values.empty()) {
         return stats;
     }
     
-    std::vector<double> sorted = values;
-    std::sort(sorted.begin(), sorted.end());
-    
-    stats.count = static_cast<unsigned int>(values.size());
-    stats.min = sorted.front();
-    stats.max = sorted.back();
-    
+    // min, max and sum in one pass over the window
+    double min = values.front();
+    double max = values.front();
     double sum = 0.0;
     for (double v : values) {
+        if (v < min) min = v;
+        if (v > max) max = v;
         sum += v;
     }
+    
+    stats.count = static_cast<unsigned int>(values.size());
+    stats.min = min;
+    stats.max = max;
     stats.avg = sum / values.size();
     
-    stats.p95 = calculatePercentile(sorted, 0.95);
-    stats.p99 = calculatePercentile(sorted, 0.99);
+    size_t p95_index = 0;
+    size_t p99_index = 0;
+    stats.p95 = selectPercentile(values, 0, 0.95, p95_index);
+    stats.p99 = selectPercentile(values, p95_index, 0.99, p99_index);
     
     return stats;
 }
 
-AggregatedVRAMInfo collectAggregatedMetrics(unsigned int window_seconds) {
-    AggregatedVRAMInfo result{};
-    result.window_seconds = window_seconds;
-    result.total_vram_bytes = 0;
-    
-    std::vector<double> allocated_vram_samples;
-    std::vector<double> used_kv_cache_samples;
-    std::vector<double> prefix_hit_rate_samples;
-    std::vector<double> requests_running_samples;
-    std::vector<double> requests_waiting_samples;
-    
-    auto start_time = std::chrono::steady_clock::now();
-    auto end_time = start_time + std::chrono::seconds(window_seconds);
+// One point of the background sampler's timeline
+struct MetricsSample {
+    std::chrono::steady_clock::time_point time;
+    unsigned long long total_vram_bytes;
+    double allocated_vram_bytes;
+    double used_kv_cache_bytes;
+    double prefix_cache_hit_rate;
+    double num_requests_running;
+    double num_requests_waiting;
+};
+
+// The sampler's timeline stored column-wise: a window is copied out one metric at a
+// time as a contiguous range rather than picking fields out of every sample record
+struct SampleColumns {
+    std::deque<std::chrono::steady_clock::time_point> time;
+    std::deque<double> allocated_vram_bytes;
+    std::deque<double> used_kv_cache_bytes;
+    std::deque<double> prefix_cache_hit_rate;
+    std::deque<double> num_requests_running;
+    std::deque<double> num_requests_waiting;
+    unsigned long long total_vram_bytes = 0;  // Newest sample's; only the latest is reported
+    
+    bool empty() const { return time.empty(); }
+    
+    void push_back(const MetricsSample& sample) {
+        time.push_back(sample.time);
+        allocated_vram_bytes.push_back(sample.allocated_vram_bytes);
+        used_kv_cache_bytes.push_back(sample.used_kv_cache_bytes);
+        prefix_cache_hit_rate.push_back(sample.prefix_cache_hit_rate);
+        num_requests_running.push_back(sample.num_requests_running);
+        num_requests_waiting.push_back(sample.num_requests_waiting);
+        total_vram_bytes = sample.total_vram_bytes;
+    }
     
-    unsigned int sample_count = 0;
-    const unsigned int max_samples = 100;
-    const auto sample_interval = std::chrono::milliseconds(500); // Sample every 500ms
+    void pop_front() {
+        time.pop_front();
+        allocated_vram_bytes.pop_front();
+        used_kv_cache_bytes.pop_front();
+        prefix_cache_hit_rate.pop_front();
+        num_requests_running.pop_front();
+        num_requests_waiting.pop_front();
+    }
     
-    while (std::chrono::steady_clock::now() < end_time && sample_count < max_samples) {
-        DetailedVRAMInfo info = getDetailedVRAMUsage();
-        
-        if (result.total_vram_bytes == 0) {
-            result.total_vram_bytes = info.total;
+    void clear() {
+        *this = SampleColumns{};
+    }
+};
+
+static const auto SAMPLE_INTERVAL = std::chrono::milliseconds(500);
+static const auto SAMPLE_RETENTION = std::chrono::seconds(60);   // Largest window a request may ask for
+static const auto SAMPLER_IDLE_TIMEOUT = std::chrono::seconds(120);
+
+static std::mutex sampler_mutex;
+static std::condition_variable sampler_cv;
+static SampleColumns samples;
+static std::vector<ModelVRAMInfo> latest_models;
+static std::chrono::steady_clock::time_point last_request_time;
+
+static void takeSample() {
+    DetailedVRAMInfo info = getDetailedVRAMUsage();
+    
+    MetricsSample sample;
+    sample.time = std::chrono::steady_clock::now();
+    sample.total_vram_bytes = info.total;
+    sample.allocated_vram_bytes = static_cast<double>(info.used);
+    sample.used_kv_cache_bytes = static_cast<double>(info.used_kv_cache_bytes);
+    sample.prefix_cache_hit_rate = info.prefix_cache_hit_rate;
+    
+    // Request counts come from the same scrape as the snapshot; fetching them
+    // separately listed containers and scraped every model a second time per sample
+    sample.num_requests_running = static_cast<double>(info.num_requests_running);
+    sample.num_requests_waiting = static_cast<double>(info.num_requests_waiting);
+    
+    // Only include models that have allocated VRAM (running models). info is a local
+    // copy, so the entries (and their id strings) are moved rather than copied.
+    std::vector<ModelVRAMInfo> models;
+    models.reserve(info.models.size());
+    for (auto& model : info.models) {
+        if (model.allocated_vram_bytes > 0) {
+            models.push_back(std::move(model));
         }
-        
-        allocated_vram_samples.push_back(static_cast<double>(info.used));
-        used_kv_cache_samples.push_back(static_cast<double>(info.used_kv_cache_bytes));
-        prefix_hit_rate_samples.push_back(info.prefix_cache_hit_rate);
-        
-        auto models_data = fetchPerModelBlockData();
-        unsigned int total_requests_running = 0;
-        unsigned int total_requests_waiting = 0;
-        
-        for (const auto& model_data : models_data) {
-            if (model_data.available) {
-                total_requests_running += model_data.num_requests_running;
-                total_requests_waiting += model_data.num_requests_waiting;
+    }
+    
+    std::lock_guard<std::mutex> lock(sampler_mutex);
+    samples.push_back(sample);
+    while (!samples.empty() && sample.time - samples.time.front() > SAMPLE_RETENTION) {
+        samples.pop_front();
+    }
+    latest_models = std::move(models);
+    sampler_cv.notify_all();
+}
+
+static void samplerLoop() {
+    auto next_sample = std::chrono::steady_clock::now();
+    while (true) {
+        {
+            // Park while nobody is asking for aggregates so idle servers don't keep scraping
+            std::unique_lock<std::mutex> lock(sampler_mutex);
+            auto idle = [] { return std::chrono::steady_clock::now() - last_request_time > SAMPLER_IDLE_TIMEOUT; };
+            if (idle()) {
+                samples.clear();
+                sampler_cv.wait(lock, [&] { return !idle(); });
+                next_sample = std::chrono::steady_clock::now();
             }
         }
         
-        requests_running_samples.push_back(static_cast<double>(total_requests_running));
-        requests_waiting_samples.push_back(static_cast<double>(total_requests_waiting));
-        
-        sample_count++;
+        try {
+            takeSample();
+        } catch (const std::exception& e) {
+            LOG_ERROR("Metrics sampler error: " + std::string(e.what()));
+        }
         
-        if (std::chrono::steady_clock::now() < end_time) {
-            std::this_thread::sleep_for(sample_interval);
+        next_sample += SAMPLE_INTERVAL;
+        auto now = std::chrono::steady_clock::now();
+        if (next_sample < now) {
+            next_sample = now;
         }
+        std::this_thread::sleep_until(next_sample);
+    }
+}
+
+AggregatedVRAMInfo collectAggregatedMetrics(unsigned int window_seconds) {
+    static std::once_flag sampler_started;
+    
+    AggregatedVRAMInfo result{};
+    result.window_seconds = window_seconds;
+    result.total_vram_bytes = 0;
+    
+    std::unique_lock<std::mutex> lock(sampler_mutex);
+    last_request_time = std::chrono::steady_clock::now();
+    std::call_once(sampler_started, [] {
+        std::thread(samplerLoop).detach();
+        LOG_INFO("Started metrics sampler thread (every 500ms)");
+    });
+    sampler_cv.notify_all();
+    
+    // The window is the most recent window_seconds of the sampler's timeline. A freshly
+    // started (or woken) sampler has less history than that, so wait until it has
+    // sampled a full window rather than report one built from a single sample.
+    auto window_length = std::chrono::seconds(window_seconds);
+    auto request_time = last_request_time;
+    bool cold = samples.empty() || samples.time.front() > request_time - window_length;
+    sampler_cv.wait_until(lock, request_time + window_length + std::chrono::seconds(5), [&] {
+        if (samples.empty()) return false;
+        return !cold || samples.time.back() - samples.time.front() >= window_length;
+    });
+    
+    // Samples are appended in time order, so the window start is a binary search away.
+    // Always keep the newest sample so slow collections still produce a result.
+    auto cutoff = std::chrono::steady_clock::now() - window_length;
+    size_t window_begin = static_cast<size_t>(
+        std::lower_bound(samples.time.begin(), samples.time.end(), cutoff) - samples.time.begin());
+    if (window_begin == samples.time.size() && !samples.empty()) {
+        --window_begin;
     }
     
-    result.sample_count = sample_count;
-    result.allocated_vram_bytes = calculateStats(allocated_vram_samples);
-    result.used_kv_cache_bytes = calculateStats(used_kv_cache_samples);
-    result.prefix_cache_hit_rate = calculateStats(prefix_hit_rate_samples);
-    result.num_requests_running = calculateStats(requests_running_samples);
-    result.num_requests_waiting = calculateStats(requests_waiting_samples);
-    
-    // Get final snapshot to extract actual model data (only running models)
-    DetailedVRAMInfo final_info = getDetailedVRAMUsage();
-    result.models.clear();
-    for (const auto& model : final_info.models) {
-        // Only include models that have allocated VRAM (running models)
-        if (model.allocated_vram_bytes > 0) {
-            result.models.push_back(model);
-        }
+    auto window = [window_begin](const std::deque<double>& column) {
+        return std::vector<double>(column.begin() + window_begin, column.end());
+    };
+    std::vector<double> allocated_vram_samples = window(samples.allocated_vram_bytes);
+    std::vector<double> used_kv_cache_samples = window(samples.used_kv_cache_bytes);
+    std::vector<double> prefix_hit_rate_samples = window(samples.prefix_cache_hit_rate);
+    std::vector<double> requests_running_samples = window(samples.num_requests_running);
+    std::vector<double> requests_waiting_samples = window(samples.num_requests_waiting);
+    
+    if (!samples.empty()) {
+        result.total_vram_bytes = samples.total_vram_bytes;
     }
+    result.models = latest_models;
+    lock.unlock();
+    
+    result.sample_count = static_cast<unsigned int>(allocated_vram_samples.size());
+    result.allocated_vram_bytes = calculateStats(std::move(allocated_vram_samples));
+    result.used_kv_cache_bytes = calculateStats(std::move(used_kv_cache_samples));
+    result.prefix_cache_hit_rate = calculateStats(std::move(prefix_hit_rate_samples));
+    result.num_requests_running = calculateStats(std::move(requests_running_samples));
+    result.num_requests_waiting = calculateStats(std::move(requests_waiting_samples));
     
     return result;
 }
-
@@ -10,7 +10,8 @@
 #include <string>
 
 void handleDeployRequest(http::request<http::string_body>& req, tcp::socket& socket) {
-    std::string body = req.body();
+    // Parse the body once and read every field from the same document
+    nlohmann::json body = parseJSONObject(req.body());
     std::string model_id_raw = parseJSONField(body, "model_id");
     std::string hf_token = parseJSONField(body, "hf_token");
     int requested_port = parseJSONInt(body, "port", 0); // 0 means auto-assign
@@ -8,7 +8,6 @@
 #include <sstream>
 #include <fstream>
 #include <string>
-#include <regex>
 #include <absl/strings/str_cat.h>
 #include <thread>
 #include <chrono>
@@ -45,7 +44,7 @@ std::string urlEncode(const std::string& str) {
 }
 
 // Helper function to get Docker command prefix (with or without sudo)
-std::string getDockerCmd() {
+static std::string detectDockerCmd() {
     std::string use_sudo = getEnvValue("USE_SUDO_DOCKER", "");
     if (use_sudo == "true" || use_sudo == "1" || use_sudo == "yes") {
         return "sudo docker";
@@ -64,8 +63,14 @@ std::string getDockerCmd() {
     return "docker";
 }
 
+// Probed once per process rather than on every deploy
+std::string getDockerCmd() {
+    static const std::string docker_cmd = detectDockerCmd();
+    return docker_cmd;
+}
+
 // Get number of GPUs available
-int getGPUCount() {
+static int queryGPUCount() {
     int gpu_count = 1; // Default to 1
     
     // Try nvidia-smi first
@@ -84,6 +89,11 @@ int getGPUCount() {
     return gpu_count;
 }
 
+int getGPUCount() {
+    static const int gpu_count = queryGPUCount();
+    return gpu_count;
+}
+
 // Search for model using HuggingFace API
 std::string searchHFModel(const std::string& search_term, const std::string& hf_token) {
     // Trim whitespace from search term
@@ -342,7 +352,7 @@ std::string getConfigPathForGPU(const std::string& gpu_type) {
 
 std::string generateDockerCommand(const std::string& model_id, const std::string& hf_token, int port, const std::string& config_path, int tensor_parallel_size) {
     std::ostringstream cmd;
-    std::string container_name = "vllm-" + std::regex_replace(model_id, std::regex("[^a-zA-Z0-9]"), "-");
+    std::string container_name = getContainerName(model_id);
     
     std::string abs_config_path = config_path;
     if (config_path.find("/") != 0) {
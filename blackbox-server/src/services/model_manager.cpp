@@ -10,15 +10,16 @@
 #include <regex>
 #include <algorithm>
 #include <map>
-#include <set>
+#include <unordered_set>
 #include <deque>
-#include <numeric>
 #include <thread>
 #include <chrono>
+#include <mutex>
+#include <random>
 #include <absl/strings/str_cat.h>
 
 // Helper function to get Docker command prefix (with or without sudo)
-static std::string getDockerCmd() {
+static std::string detectDockerCmd() {
     std::string use_sudo = getEnvValue("USE_SUDO_DOCKER", "");
     if (use_sudo == "true" || use_sudo == "1" || use_sudo == "yes") {
         return "sudo docker";
@@ -37,7 +38,15 @@ static std::string getDockerCmd() {
     return "docker";
 }
 
+// Probed once per process; every list/stop call used to spawn its own docker ps
+static const std::string& getDockerCmd() {
+    static const std::string docker_cmd = detectDockerCmd();
+    return docker_cmd;
+}
+
+// Guarded by model_metrics_mutex: written from request handlers and the health check thread
 static std::map<std::string, ModelMetrics> model_metrics;
+static std::mutex model_metrics_mutex;
 static const int MAX_SAMPLES = 100;
 
 int getMaxConcurrentModels() {
@@ -51,7 +60,9 @@ int getMaxConcurrentModels() {
 }
 
 std::string getContainerName(const std::string& model_id) {
-    return "vllm-" + std::regex_replace(model_id, std::regex("[^a-zA-Z0-9]"), "-");
+    // Compiled once; this runs for every deploy, spindown and deployment check
+    static const std::regex non_alnum_regex("[^a-zA-Z0-9]");
+    return "vllm-" + std::regex_replace(model_id, non_alnum_regex, "-");
 }
 
 std::vector<DeployedModel> listDeployedModels() {
@@ -115,27 +126,8 @@ std::vector<DeployedModel> listDeployedModels() {
             }
         }
         
-        // Verify the container is actually running with docker inspect
-        std::string inspect_cmd = absl::StrCat("timeout 2 ", docker_cmd, " inspect --format '{{.State.Running}}' ", container_id, " 2>/dev/null");
-        FILE* inspect_pipe = popen(inspect_cmd.c_str(), "r");
-        bool is_actually_running = false;
-        if (inspect_pipe) {
-            char inspect_buffer[16];
-            if (fgets(inspect_buffer, sizeof(inspect_buffer), inspect_pipe)) {
-                std::string running_state(inspect_buffer);
-                running_state.erase(0, running_state.find_first_not_of(" \t\n\r"));
-                running_state.erase(running_state.find_last_not_of(" \t\n\r") + 1);
-                is_actually_running = (running_state == "true");
-            }
-            pclose(inspect_pipe);
-        }
-        
-        // Only add if actually running
-        if (!is_actually_running) {
-            LOG_DEBUG("Skipping non-running container: " + name + " (status: " + status + ")");
-            continue;
-        }
-        
+        // The status=running filter above already reflects container state; no
+        // per-container docker inspect round-trip is needed to confirm it
         DeployedModel model;
         model.model_id = model_id;
         model.container_id = container_id;
@@ -143,7 +135,7 @@ std::vector<DeployedModel> listDeployedModels() {
         model.port = port;
         model.running = true;
         
-        models.push_back(model);
+        models.push_back(std::move(model));
     }
     pclose(pipe);
     
@@ -177,7 +169,8 @@ int getDeployedModelCount() {
 
 int getNextAvailablePort(int preferred_port) {
     std::vector<DeployedModel> models = listDeployedModels();
-    std::set<int> used_ports;
+    std::unordered_set<int> used_ports;
+    used_ports.reserve(models.size());
     
     for (const auto& model : models) {
         used_ports.insert(model.port);
@@ -236,7 +229,7 @@ bool spindownModel(const std::string& model_id_or_container) {
     return (stop_result == 0 || rm_result == 0);
 }
 
-std::string detectGPUType() {
+static std::string queryGPUType() {
     FILE* pipe = popen("nvidia-smi --query-gpu=name --format=csv,noheader 2>/dev/null | head -1", "r");
     if (!pipe) return "T4";
     
@@ -256,24 +249,31 @@ std::string detectGPUType() {
     return "T4";
 }
 
+// The GPU doesn't change while the server runs, so nvidia-smi is only queried once
+std::string detectGPUType() {
+    static const std::string gpu_type = queryGPUType();
+    return gpu_type;
+}
+
 void registerModelDeployment(const std::string& model_id, const std::string& container_name,
                             double configured_max_gpu_utilization, const std::string& gpu_type, unsigned int pid) {
     ModelMetrics metrics;
     metrics.configured_max_utilization = configured_max_gpu_utilization;
     metrics.gpu_type = gpu_type;
     metrics.pid = pid;
-    metrics.peak_usage = 0.0;
-    model_metrics[container_name] = metrics;
+    std::lock_guard<std::mutex> lock(model_metrics_mutex);
+    model_metrics[container_name] = std::move(metrics);
 }
 
 void unregisterModel(const std::string& container_name) {
+    std::lock_guard<std::mutex> lock(model_metrics_mutex);
     model_metrics.erase(container_name);
 }
 
-// Clean up model_metrics for containers that no longer exist or aren't running
-static void cleanupStaleModelMetrics() {
-    auto running_models = listDeployedModels();
-    std::set<std::string> running_container_names;
+// Drop metrics for containers missing from running_models. Caller must hold model_metrics_mutex.
+static void pruneStaleModelMetrics(const std::vector<DeployedModel>& running_models) {
+    std::unordered_set<std::string> running_container_names;
+    running_container_names.reserve(running_models.size());
     for (const auto& model : running_models) {
         running_container_names.insert(model.container_name);
     }
@@ -291,19 +291,28 @@ static void cleanupStaleModelMetrics() {
 }
 
 void updateModelVRAMUsage(const std::string& container_name, double vram_percent) {
-    // Clean up stale metrics before updating
-    cleanupStaleModelMetrics();
-    
-    if (model_metrics.find(container_name) == model_metrics.end()) return;
-    
-    auto& metrics = model_metrics[container_name];
-    metrics.vram_samples.push_back(vram_percent);
-    if (metrics.vram_samples.size() > MAX_SAMPLES) {
-        metrics.vram_samples.pop_front();
-    }
-    
-    if (vram_percent > metrics.peak_usage) {
-        metrics.peak_usage = vram_percent;
+    updateModelVRAMUsage({{container_name, vram_percent}});
+}
+
+void updateModelVRAMUsage(const std::vector<std::pair<std::string, double>>& samples) {
+    // Recording only appends to known containers; dropping stale ones is left to the
+    // periodic health pass (and optimize), not repeated on every stream tick
+    std::lock_guard<std::mutex> lock(model_metrics_mutex);
+    for (const auto& [container_name, vram_percent] : samples) {
+        auto it = model_metrics.find(container_name);
+        if (it == model_metrics.end()) continue;
+        
+        auto& metrics = it->second;
+        metrics.vram_samples.push_back(vram_percent);
+        metrics.vram_sample_sum += vram_percent;
+        if (metrics.vram_samples.size() > MAX_SAMPLES) {
+            metrics.vram_sample_sum -= metrics.vram_samples.front();
+            metrics.vram_samples.pop_front();
+        }
+        
+        if (vram_percent > metrics.peak_usage) {
+            metrics.peak_usage = vram_percent;
+        }
     }
 }
 
@@ -313,13 +322,15 @@ OptimizationResult optimizeModelAllocations() {
     std::vector<std::string> to_restart;
     
     // Clean up stale metrics first
-    cleanupStaleModelMetrics();
+    auto running_models = listDeployedModels();
+    std::lock_guard<std::mutex> lock(model_metrics_mutex);
+    pruneStaleModelMetrics(running_models);
     
     // Now iterate only over running models
     for (const auto& [container_name, metrics] : model_metrics) {
         if (metrics.vram_samples.size() < 10) continue;
         
-        double avg = std::accumulate(metrics.vram_samples.begin(), metrics.vram_samples.end(), 0.0) / metrics.vram_samples.size();
+        double avg = metrics.vram_sample_sum / metrics.vram_samples.size();
         double threshold = metrics.configured_max_utilization * 100.0 * 0.7;
         
         if (avg < threshold && metrics.peak_usage > 0) {
@@ -340,53 +351,67 @@ OptimizationResult optimizeModelAllocations() {
 }
 
 void checkVLLMHealth() {
-    // Clean up stale metrics first
-    cleanupStaleModelMetrics();
-    
+    // One docker listing serves both the stale-metrics cleanup and the probes
     auto models = listDeployedModels();
+    {
+        std::lock_guard<std::mutex> lock(model_metrics_mutex);
+        pruneStaleModelMetrics(models);
+    }
     if (models.empty()) {
         return;
     }
     
+    // Probe every /health endpoint in a single curl invocation; -w prints one status
+    // code per URL, in argument order, instead of spawning a curl per model. Each URL
+    // needs its own -o, or later response bodies land on stdout between the codes.
+    std::string health_cmd = absl::StrCat("timeout ", models.size() + 1,
+                                          " curl -s -m 1 -w '%{http_code}\\n'");
     for (const auto& model : models) {
-        
-        // Check /health endpoint
-        std::string health_cmd = absl::StrCat(
-            "timeout 2 curl -s -w '\\nHTTP_CODE:%{http_code}' -m 1 http://localhost:", model.port, "/health 2>&1"
-        );
-        
-        FILE* health_pipe = popen(health_cmd.c_str(), "r");
-        if (health_pipe) {
-            char buffer[512];
-            std::string output;
-            std::string http_code;
-            while (fgets(buffer, sizeof(buffer), health_pipe)) {
-                std::string line(buffer);
-                if (line.find("HTTP_CODE:") != std::string::npos) {
-                    size_t pos = line.find("HTTP_CODE:") + 10;
-                    http_code = line.substr(pos);
-                    http_code.erase(http_code.find_last_not_of(" \t\n\r") + 1);
-                } else {
-                    output += line;
-                }
-            }
-            pclose(health_pipe);
-            
-            if (http_code == "200") {
-                LOG_DEBUG("vLLM health check OK: " + model.model_id + " on port " + std::to_string(model.port));
-            } else {
-                LOG_WARN("vLLM health check failed: " + model.model_id + " on port " + std::to_string(model.port) + " (HTTP " + http_code + ")");
-            }
+        absl::StrAppend(&health_cmd, " -o /dev/null http://localhost:", model.port, "/health");
+    }
+    absl::StrAppend(&health_cmd, " 2>/dev/null");
+    
+    FILE* health_pipe = popen(health_cmd.c_str(), "r");
+    if (!health_pipe) {
+        LOG_WARN("Failed to execute health check for " + std::to_string(models.size()) + " model(s)");
+        return;
+    }
+    
+    std::vector<std::string> http_codes;
+    http_codes.reserve(models.size());
+    char buffer[64];
+    while (http_codes.size() < models.size() && fgets(buffer, sizeof(buffer), health_pipe)) {
+        std::string http_code(buffer);
+        http_code.erase(http_code.find_last_not_of(" \t\n\r") + 1);
+        http_codes.push_back(http_code);
+    }
+    pclose(health_pipe);
+    
+    for (size_t i = 0; i < models.size(); ++i) {
+        const auto& model = models[i];
+        std::string http_code = i < http_codes.size() ? http_codes[i] : "";
+        if (http_code == "200") {
+            LOG_DEBUG("vLLM health check OK: " + model.model_id + " on port " + std::to_string(model.port));
         } else {
-            LOG_WARN("Failed to execute health check for " + model.model_id);
+            LOG_WARN("vLLM health check failed: " + model.model_id + " on port " + std::to_string(model.port) + " (HTTP " + http_code + ")");
         }
     }
 }
 
 void startHealthCheckThread() {
     std::thread([]() {
+        // Jitter each wake-up by up to +/-500ms around a fixed 5s schedule so the health
+        // probes drift against the 500ms metrics scrapes hitting the same vLLM servers
+        std::mt19937 rng(std::random_device{}());
+        std::uniform_int_distribution<int> jitter_ms(-500, 500);
+        auto next_check = std::chrono::steady_clock::now();
         while (true) {
-            std::this_thread::sleep_for(std::chrono::seconds(5));
+            next_check += std::chrono::seconds(5) + std::chrono::milliseconds(jitter_ms(rng));
+            std::this_thread::sleep_until(next_check);
+            auto now = std::chrono::steady_clock::now();
+            if (next_check < now) {
+                next_check = now;
+            }
             try {
                 checkVLLMHealth();
             } catch (const std::exception& e) {
@@ -394,6 +419,6 @@ void startHealthCheckThread() {
             }
         }
     }).detach();
-    LOG_INFO("Started vLLM health check thread (every 5 seconds)");
+    LOG_INFO("Started vLLM health check thread (every ~5 seconds)");
 }
 
@@ -3,6 +3,19 @@
 #include <string>
 #include <absl/strings/str_cat.h>
 
+// Whether ncu is on PATH, checked once: forking a shell for `which` on every call
+// cost a process spawn per GPU process per snapshot just to get the same answer
+static bool isNcuAvailable() {
+    static const bool available = [] {
+        FILE* ncu_check = popen("which ncu > /dev/null 2>&1", "r");
+        if (!ncu_check) {
+            return false;
+        }
+        return pclose(ncu_check) == 0;
+    }();
+    return available;
+}
+
 NsightMetrics getNsightMetrics(unsigned int pid) {
     NsightMetrics metrics{};
     metrics.atomic_operations = 0;
@@ -14,12 +27,7 @@ NsightMetrics getNsightMetrics(unsigned int pid) {
     metrics.dram_write_bytes = 0;
     metrics.available = false;
     
-    FILE* ncu_check = popen("which ncu > /dev/null 2>&1", "r");
-    if (!ncu_check) {
-        return metrics;
-    }
-    int ncu_available = pclose(ncu_check);
-    if (ncu_available != 0) {
+    if (!isNcuAvailable()) {
         return metrics;
     }
     
@@ -9,7 +9,10 @@
 #include <string>
 #include <algorithm>
 #include <map>
-#include <sstream>
+#include <unordered_map>
+#include <mutex>
+#include <chrono>
+#include <utility>
 #include <absl/strings/str_cat.h>
 #ifdef NVML_AVAILABLE
 #include <nvml.h>
@@ -84,8 +87,8 @@ void shutdownNVML() {
     }
 }
 
-DetailedVRAMInfo getDetailedVRAMUsage() {
-    DetailedVRAMInfo detailed = {0, 0, 0, 0, {}, {}, {}, 0, 0, 0, 0ULL, 0.0, {}, 0ULL, 0.0, {}};
+static DetailedVRAMInfo collectDetailedVRAMUsage() {
+    DetailedVRAMInfo detailed{};
     if (!initNVML()) {
         return detailed;
     }
@@ -103,8 +106,10 @@ DetailedVRAMInfo getDetailedVRAMUsage() {
     unsigned long long total_atomic_allocations = 0;
     
     if (nvmlDeviceGetComputeRunningProcesses(g_device, &processCount, processes) == NVML_SUCCESS) {
+        // Size the list once and fill each record in place rather than copying it in
+        detailed.processes.reserve(processCount);
         for (unsigned int i = 0; i < processCount; ++i) {
-            ProcessMemory pm;
+            ProcessMemory& pm = detailed.processes.emplace_back();
             pm.pid = processes[i].pid;
             pm.used_bytes = processes[i].usedGpuMemory;
             pm.reserved_bytes = processes[i].usedGpuMemory;
@@ -126,7 +131,6 @@ DetailedVRAMInfo getDetailedVRAMUsage() {
             } else {
                 pm.name = "unknown";
             }
-            detailed.processes.push_back(pm);
             
             // Only try to get nsight metrics for vLLM/python processes to avoid hanging
             // Skip nsight metrics collection if it might be slow
@@ -150,71 +154,82 @@ DetailedVRAMInfo getDetailedVRAMUsage() {
     unsigned int total_allocated_blocks = 0;
     unsigned int total_utilized_blocks = 0;
     
-    // Get deployed models to match processes to containers (only running ones)
-    auto all_deployed_models = listDeployedModels();
-    std::vector<DeployedModel> deployed_models;
-    for (const auto& model : all_deployed_models) {
-        if (model.running) {
-            deployed_models.push_back(model);
-        }
-    }
-    
-    // Create a map of model_id -> process memory for block size calculation
+    // Process memory per model, indexed like models_data, for block size calculation
     // Match processes to models by checking which container they belong to
-    std::map<std::string, unsigned long long> model_memory;
-    for (const auto& pm : detailed.processes) {
-        if (pm.name.find("python") != std::string::npos || 
-            pm.name.find("vllm") != std::string::npos ||
-            pm.name.find("VLLM") != std::string::npos) {
-            // Check process's cgroup to find container
-            std::ostringstream cgroup_cmd;
-            cgroup_cmd << "cat /proc/" << pm.pid << "/cgroup 2>/dev/null | grep docker";
-            FILE* cgroup_pipe = popen(cgroup_cmd.str().c_str(), "r");
-            if (cgroup_pipe) {
-                char cgroup_line[512];
-                if (fgets(cgroup_line, sizeof(cgroup_line), cgroup_pipe)) {
-                    std::string cgroup(cgroup_line);
-                    // Extract container ID from cgroup path
-                    size_t docker_pos = cgroup.find("/docker/");
-                    if (docker_pos != std::string::npos) {
-                        size_t container_start = docker_pos + 8;
-                        size_t container_end = cgroup.find("/", container_start);
-                        if (container_end == std::string::npos) {
-                            container_end = cgroup.find("\n", container_start);
+    std::vector<unsigned long long> model_memory(models_data.size(), 0);
+    
+    // Without running models there is nothing to attribute process memory to,
+    // so skip the docker listing and per-process cgroup lookups entirely
+    if (!models_data.empty()) {
+        // Get deployed models to match processes to containers (listDeployedModels only returns running ones)
+        auto deployed_models = listDeployedModels();
+        
+        // Index containers by docker's 12-character short id, keeping only models the
+        // scrape reported, so each process resolves to its model's slot with one lookup
+        std::unordered_map<std::string, size_t> model_index;
+        for (size_t i = 0; i < models_data.size(); ++i) {
+            model_index.emplace(models_data[i].model_id, i);
+        }
+        std::unordered_map<std::string, size_t> container_to_model;
+        for (const auto& deployed : deployed_models) {
+            auto index_it = model_index.find(deployed.model_id);
+            if (index_it != model_index.end()) {
+                container_to_model.emplace(deployed.container_id.substr(0, 12), index_it->second);
+            }
+        }
+        
+        for (const auto& pm : detailed.processes) {
+            if (pm.name.find("python") != std::string::npos || 
+                pm.name.find("vllm") != std::string::npos ||
+                pm.name.find("VLLM") != std::string::npos) {
+                // Check process's cgroup to find container. The file is read directly
+                // (first line mentioning docker) rather than forking a cat | grep per process.
+                FILE* cgroup_file = fopen(absl::StrCat("/proc/", pm.pid, "/cgroup").c_str(), "r");
+                if (cgroup_file) {
+                    char cgroup_line[512];
+                    while (fgets(cgroup_line, sizeof(cgroup_line), cgroup_file)) {
+                        std::string cgroup(cgroup_line);
+                        if (cgroup.find("docker") == std::string::npos) {
+                            continue;
                         }
-                        if (container_end != std::string::npos) {
-                            std::string container_id = cgroup.substr(container_start, container_end - container_start);
-                            // Find which model this container belongs to
-                            for (const auto& deployed : deployed_models) {
-                                if (deployed.container_id.find(container_id) == 0 || container_id.find(deployed.container_id) == 0) {
-                                    // Match found - use the model_id from models_data that matches
-                                    for (const auto& model_data : models_data) {
-                                        if (model_data.model_id == deployed.model_id) {
-                                            // Sum up memory for all processes in this model
-                                            model_memory[model_data.model_id] += pm.used_bytes;
-                                            break;
-                                        }
-                                    }
-                                    break;
+                        // Extract container ID from cgroup path
+                        size_t docker_pos = cgroup.find("/docker/");
+                        if (docker_pos != std::string::npos) {
+                            size_t container_start = docker_pos + 8;
+                            size_t container_end = cgroup.find("/", container_start);
+                            if (container_end == std::string::npos) {
+                                container_end = cgroup.find("\n", container_start);
+                            }
+                            if (container_end != std::string::npos) {
+                                std::string container_id = cgroup.substr(container_start, container_end - container_start);
+                                // Find which model this container belongs to
+                                auto model_it = container_to_model.find(container_id.substr(0, 12));
+                                if (model_it != container_to_model.end()) {
+                                    // Sum up memory for all processes in this model
+                                    model_memory[model_it->second] += pm.used_bytes;
                                 }
                             }
                         }
+                        break;
                     }
+                    fclose(cgroup_file);
                 }
-                pclose(cgroup_pipe);
             }
         }
     }
     
-    // Create blocks for each model and calculate used KV cache bytes
+    // Calculate per-model block usage and used KV cache bytes. Only the per-model and
+    // total counts are reported, so no per-block records are materialized.
+    detailed.models.reserve(models_data.size());
+    
     unsigned long long total_used_kv_cache_bytes = 0;
-    for (const auto& model_data : models_data) {
+    unsigned long long total_allocated_vram_matched = 0;
+    double total_prefix_hit_rate = 0.0;
+    int models_with_prefix_data = 0;
+    for (size_t i = 0; i < models_data.size(); ++i) {
+        const auto& model_data = models_data[i];
         // Always include models, even if metrics aren't available yet
-        ModelVRAMInfo model_info;
-        model_info.model_id = model_data.model_id;
-        model_info.port = model_data.port;
-        model_info.allocated_vram_bytes = 0;
-        model_info.used_kv_cache_bytes = 0;
+        ModelVRAMInfo model_info{model_data.model_id, model_data.port};
         
         LOG_DEBUG("Processing model " + model_data.model_id + ": available=" + (model_data.available ? "true" : "false") + 
                  ", num_gpu_blocks=" + std::to_string(model_data.num_gpu_blocks) +
@@ -223,12 +238,9 @@ DetailedVRAMInfo getDetailedVRAMUsage() {
         if (model_data.available && model_data.num_gpu_blocks > 0) {
             // Calculate block size for this model
             unsigned long long calculated_block_size = model_data.block_size;
-            unsigned long long model_allocated_vram = 0;
-            if (model_memory.find(model_data.model_id) != model_memory.end()) {
-                model_allocated_vram = model_memory[model_data.model_id];
-                if (model_data.num_gpu_blocks > 0 && model_allocated_vram > 0) {
-                    calculated_block_size = model_allocated_vram / model_data.num_gpu_blocks;
-                }
+            unsigned long long model_allocated_vram = model_memory[i];
+            if (model_allocated_vram > 0) {
+                calculated_block_size = model_allocated_vram / model_data.num_gpu_blocks;
             }
             
             // If we don't have allocated VRAM, use a default block size (16KB is typical)
@@ -267,35 +279,28 @@ DetailedVRAMInfo getDetailedVRAMUsage() {
             LOG_DEBUG("Model " + model_data.model_id + ": final allocated_vram_bytes=" + std::to_string(model_info.allocated_vram_bytes) +
                      ", used_kv_cache_bytes=" + std::to_string(model_info.used_kv_cache_bytes));
             
-            // Create blocks for this model
-            for (unsigned int i = 0; i < model_data.num_gpu_blocks; ++i) {
-                MemoryBlock block;
-                block.block_id = i;
-                block.address = 0;
-                block.size = calculated_block_size;
-                block.type = "kv_cache";
-                block.allocated = true;
-                block.utilized = (i < model_utilized);
-                block.model_id = model_data.model_id;
-                block.port = model_data.port;
-                detailed.blocks.push_back(block);
-            }
-            
             total_allocated_blocks += model_data.num_gpu_blocks;
             total_utilized_blocks += model_utilized;
+            total_allocated_vram_matched += model_allocated_vram;
         }
         
-        detailed.models.push_back(model_info);
+        if (model_data.available) {
+            detailed.num_requests_running += model_data.num_requests_running;
+            detailed.num_requests_waiting += model_data.num_requests_waiting;
+        }
+        
+        if (model_data.available && model_data.prefix_cache_hit_rate > 0.0) {
+            total_prefix_hit_rate += model_data.prefix_cache_hit_rate;
+            models_with_prefix_data++;
+        }
+        
+        detailed.models.push_back(std::move(model_info));
     }
     
     detailed.allocated_blocks = total_allocated_blocks;
     detailed.utilized_blocks = total_utilized_blocks;
     detailed.free_blocks = total_allocated_blocks - total_utilized_blocks;
     
-    if (detailed.allocated_blocks > 0) {
-        detailed.free_blocks = detailed.allocated_blocks - detailed.utilized_blocks;
-    }
-
     detailed.atomic_allocations = total_atomic_allocations > 0 ? total_atomic_allocations : detailed.used;
 
     detailed.fragmentation_ratio = detailed.total > 0 ? 
@@ -304,26 +309,13 @@ DetailedVRAMInfo getDetailedVRAMUsage() {
     detailed.used_kv_cache_bytes = total_used_kv_cache_bytes;
     LOG_DEBUG("Total used_kv_cache_bytes: " + std::to_string(total_used_kv_cache_bytes) + ", total_allocated_blocks: " + std::to_string(total_allocated_blocks));
     
-    // Calculate average prefix cache hit rate from all models
-    double total_prefix_hit_rate = 0.0;
-    int models_with_prefix_data = 0;
-    for (const auto& model_data : models_data) {
-        if (model_data.available && model_data.prefix_cache_hit_rate > 0.0) {
-            total_prefix_hit_rate += model_data.prefix_cache_hit_rate;
-            models_with_prefix_data++;
-        }
-    }
+    // Average prefix cache hit rate from all models (summed in the per-model pass)
     detailed.prefix_cache_hit_rate = models_with_prefix_data > 0 ? 
         (total_prefix_hit_rate / models_with_prefix_data) : 0.0;
     
     // If we couldn't match processes to models, distribute total allocated VRAM proportionally
     // based on KV cache usage or number of models
     if (detailed.used > 0) {
-        unsigned long long total_allocated_vram_matched = 0;
-        for (const auto& model : detailed.models) {
-            total_allocated_vram_matched += model.allocated_vram_bytes;
-        }
-        
         // If we matched less than 50% of total VRAM, distribute the rest
         if (total_allocated_vram_matched < detailed.used * 0.5) {
             unsigned long long remaining_vram = detailed.used - total_allocated_vram_matched;
@@ -351,3 +343,23 @@ DetailedVRAMInfo getDetailedVRAMUsage() {
     return detailed;
 }
 
+// Stream ticks, the aggregation sampler and /vram requests all ask for the same
+// snapshot; collecting costs NVML calls plus docker and vLLM scrapes, so recent
+// results are shared. Holding the lock while collecting also makes concurrent
+// callers wait for the in-flight collection instead of starting their own.
+static const auto VRAM_CACHE_TTL = std::chrono::milliseconds(250);
+static std::mutex vram_cache_mutex;
+static DetailedVRAMInfo vram_cache;
+static std::chrono::steady_clock::time_point vram_cache_time;
+static bool vram_cache_valid = false;
+
+DetailedVRAMInfo getDetailedVRAMUsage() {
+    std::lock_guard<std::mutex> lock(vram_cache_mutex);
+    auto now = std::chrono::steady_clock::now();
+    if (!vram_cache_valid || now - vram_cache_time >= VRAM_CACHE_TTL) {
+        vram_cache = collectDetailedVRAMUsage();
+        vram_cache_time = std::chrono::steady_clock::now();
+        vram_cache_valid = true;
+    }
+    return vram_cache;
+}
@@ -13,6 +13,7 @@
 #include <vector>
 #include <fstream>
 #include <algorithm>
+#include <unordered_map>
 
 void handleOptimizeRequest(http::request<http::string_body>& req, tcp::socket& socket) {
     OptimizationResult opt_result = optimizeModelAllocations();
@@ -30,27 +31,29 @@ void handleOptimizeRequest(http::request<http::string_body>& req, tcp::socket& s
         return;
     }
     
+    // List the deployments once and look each restart target up by container name,
+    // rather than re-running docker ps for every model being restarted
+    std::unordered_map<std::string, DeployedModel> models_by_container;
+    for (auto& m : listDeployedModels()) {
+        std::string container_name = m.container_name;
+        models_by_container.emplace(std::move(container_name), std::move(m));
+    }
+    const std::string hf_token = getEnvValue("HF_TOKEN");
+    
     std::vector<std::string> restarted;
     for (const auto& container_name : opt_result.restarted_models) {
-        auto models = listDeployedModels();
-        std::string model_id;
-        std::string gpu_type;
-        double peak_usage = 0.0;
+        auto model_it = models_by_container.find(container_name);
+        if (model_it == models_by_container.end()) continue;
         
-        for (const auto& m : models) {
-            if (m.container_name == container_name) {
-                model_id = m.model_id;
-                gpu_type = m.gpu_type;
-                peak_usage = m.peak_vram_usage_percent / 100.0;
-                break;
-            }
-        }
+        const DeployedModel& m = model_it->second;
+        std::string model_id = m.model_id;
+        std::string gpu_type = m.gpu_type;
+        double peak_usage = m.peak_vram_usage_percent / 100.0;
         
         if (model_id.empty()) continue;
         
         spindownModel(container_name);
         
-        std::string hf_token = getEnvValue("HF_TOKEN");
         if (gpu_type.empty()) gpu_type = detectGPUType();
         std::string config_path = getConfigPathForGPU(gpu_type);
         
@@ -8,7 +8,7 @@
 #include <string>
 
 void handleSpindownRequest(http::request<http::string_body>& req, tcp::socket& socket) {
-    std::string body = req.body();
+    nlohmann::json body = parseJSONObject(req.body());
     std::string model_id = parseJSONField(body, "model_id");
     std::string container_id = parseJSONField(body, "container_id");
     
@@ -74,17 +74,21 @@ void handleListModelsRequest(http::request<http::string_body>& req, tcp::socket&
     response_json["running"] = running;
     response_json["max_allowed"] = max_allowed;
     
+    // Rows are built in place in a pre-sized array and moved into the response,
+    // rather than filled key by key and then deep-copied on push_back and assignment
     nlohmann::json models_array = nlohmann::json::array();
-    for (const auto& model : models) {
-        nlohmann::json model_json;
-        model_json["model_id"] = model.model_id;
-        model_json["container_id"] = model.container_id;
-        model_json["container_name"] = model.container_name;
-        model_json["port"] = model.port;
-        model_json["running"] = model.running;
-        models_array.push_back(model_json);
+    auto& rows = models_array.get_ref<nlohmann::json::array_t&>();
+    rows.reserve(models.size());
+    for (auto& model : models) {
+        rows.push_back({
+            {"model_id", std::move(model.model_id)},
+            {"container_id", std::move(model.container_id)},
+            {"container_name", std::move(model.container_name)},
+            {"port", model.port},
+            {"running", model.running},
+        });
     }
-    response_json["models"] = models_array;
+    response_json["models"] = std::move(models_array);
     
     res.body() = response_json.dump();
     res.prepare_payload();
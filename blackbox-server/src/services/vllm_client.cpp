@@ -2,423 +2,398 @@
 #include "services/model_manager.h"
 #include "utils/env_utils.h"
 #include "utils/logger.h"
-#include <cstdio>
 #include <cstdlib>
 #include <cctype>
 #include <iostream>
 #include <string>
-#include <sstream>
+#include <string_view>
+#include <algorithm>
+#include <future>
+#include <map>
+#include <unordered_set>
+#include <memory>
+#include <mutex>
+#include <chrono>
+#include <boost/asio/thread_pool.hpp>
+#include <boost/asio/post.hpp>
+#include <boost/beast/core.hpp>
+#include <boost/beast/http.hpp>
 
-VLLMBlockData fetchVLLMBlockData() {
-    VLLMBlockData data{0, 0, 0.0, 0.0, false};
+namespace net = boost::asio;
+namespace beast = boost::beast;
+namespace http = beast::http;
+using tcp = net::ip::tcp;
+
+// Values picked out of one model's Prometheus /metrics text
+struct MetricsScrape {
+    unsigned long long model_blocks = 0;
+    double kv_usage = 0.0;
+    unsigned long long cache_query_total = 0;
+    unsigned long long cache_query_hit = 0;
+    unsigned int requests_running = 0;
+    unsigned int requests_waiting = 0;
+    bool found_cache_config = false;
+};
+
+// Parse the sample value that follows the metric name / label set
+static bool parseSampleValue(std::string_view line, size_t name_end, double& value) {
+    size_t brace = line.rfind('}');
+    size_t start = (brace != std::string_view::npos && brace > name_end) ? brace + 1 : name_end;
+    start = line.find_first_not_of(" \t", start);
+    if (start == std::string_view::npos) return false;
+    size_t end = line.find_first_of(" \t\r\n", start);
+    if (end == std::string_view::npos) end = line.size();
     
-    // Get all deployed models and filter to only running ones
-    auto all_models = listDeployedModels();
-    std::vector<DeployedModel> models;
-    for (const auto& model : all_models) {
-        if (model.running) {
-            models.push_back(model);
-        }
-    }
+    char buffer[64];
+    size_t len = std::min(end - start, sizeof(buffer) - 1);
+    if (len == 0) return false;
+    line.copy(buffer, len, start);
+    buffer[len] = '\0';
     
-    unsigned long long total_blocks = 0;
-    unsigned long long total_block_size = 0;
-    double total_kv_usage = 0.0;
-    double total_prefix_hit_rate = 0.0;
-    int active_models = 0;
+    char* parse_end = nullptr;
+    value = std::strtod(buffer, &parse_end);
+    return parse_end != buffer;
+}
+
+// Single pass over one exposition line: dispatch on the metric name instead of
+// searching the whole line for every metric we care about
+static void parseMetricsLine(std::string_view line, MetricsScrape& scrape) {
+    if (line.empty() || line[0] == '#' || line.compare(0, 5, "vllm:") != 0) return;
     
-    for (const auto& model : models) {
-        
-        // Use timeout wrapper to ensure curl doesn't hang
-        // Try to get host from environment, default to localhost
-        std::string vllm_host = getEnvValue("VLLM_HOST", "localhost");
-        std::ostringstream cmd;
-        cmd << "timeout 2 bash -c 'curl -s --max-time 1.5 --connect-timeout 1.0 http://" 
-            << vllm_host << ":" << model.port << "/metrics 2>/dev/null || echo'";
-        
-        FILE* curl = popen(cmd.str().c_str(), "r");
-        if (!curl) continue;
-        
-        char line[4096];
-        unsigned long long model_blocks = 0;
-        double model_kv_usage = 0.0;
-        double model_prefix_hit_rate = 0.0;
-        unsigned long long cache_query_total = 0;
-        unsigned long long cache_query_hit = 0;
-        unsigned int requests_running = 0;
-        unsigned int requests_waiting = 0;
-        
-        while (fgets(line, sizeof(line), curl)) {
-            std::string line_str(line);
-            
-            size_t pos = line_str.find("vllm:cache_config_info");
-            if (pos != std::string::npos) {
-                size_t num_blocks_pos = line_str.find("num_gpu_blocks=\"", pos);
-                if (num_blocks_pos != std::string::npos) {
-                    num_blocks_pos += 16;
-                    size_t num_blocks_end = line_str.find("\"", num_blocks_pos);
-                    if (num_blocks_end != std::string::npos) {
-                        std::string value_str = line_str.substr(num_blocks_pos, num_blocks_end - num_blocks_pos);
-                        std::string digits;
-                        for (char c : value_str) {
-                            if (std::isdigit(c)) digits += c;
-                        }
-                        if (!digits.empty()) {
-                            model_blocks = std::stoull(digits);
-                        }
-                    }
-                }
-            }
-            
-            // Parse kv_cache_usage_perc - format: vllm:kv_cache_usage_perc{...} value
-            size_t kv_usage_pos = line_str.find("vllm:kv_cache_usage_perc");
-            if (kv_usage_pos != std::string::npos && line_str[0] != '#') {
-                size_t brace_end = line_str.find("}", kv_usage_pos);
-                if (brace_end != std::string::npos) {
-                    size_t value_start = line_str.find_first_not_of(" \t", brace_end + 1);
-                    if (value_start != std::string::npos) {
-                        size_t value_end = line_str.find_first_of(" \n\r", value_start);
-                        if (value_end == std::string::npos) {
-                            value_end = line_str.length();
-                        }
-                        if (value_end > value_start) {
-                            std::string value_str = line_str.substr(value_start, value_end - value_start);
-                            try {
-                                model_kv_usage = std::stod(value_str);
-                                if (model_kv_usage < 0.0) model_kv_usage = 0.0;
-                                if (model_kv_usage > 1.0) model_kv_usage = 1.0;
-                            } catch (...) {
-                                model_kv_usage = 0.0;
-                            }
-                        }
-                    }
-                }
-            }
-            
-            // Parse prefix_cache_queries_total - format: vllm:prefix_cache_queries_total{...} value
-            if (line_str.find("vllm:prefix_cache_queries_total") != std::string::npos && line_str[0] != '#') {
-                size_t brace = line_str.find_last_of('}');
-                if (brace != std::string::npos && brace + 1 < line_str.length()) {
-                    std::string value_str = line_str.substr(brace + 1);
-                    // Trim whitespace
-                    size_t start = value_str.find_first_not_of(" \t\r\n");
-                    if (start != std::string::npos) {
-                        size_t end = value_str.find_last_not_of(" \t\r\n");
-                        value_str = value_str.substr(start, end - start + 1);
-                        try {
-                            cache_query_total = std::stoull(value_str);
-                        } catch (...) {
-                            cache_query_total = 0;
-                        }
-                    }
-                }
-            }
-            
-            // Parse prefix_cache_hits_total - format: vllm:prefix_cache_hits_total{...} value
-            if (line_str.find("vllm:prefix_cache_hits_total") != std::string::npos && line_str[0] != '#') {
-                size_t brace = line_str.find_last_of('}');
-                if (brace != std::string::npos && brace + 1 < line_str.length()) {
-                    std::string value_str = line_str.substr(brace + 1);
-                    // Trim whitespace
-                    size_t start = value_str.find_first_not_of(" \t\r\n");
-                    if (start != std::string::npos) {
-                        size_t end = value_str.find_last_not_of(" \t\r\n");
-                        value_str = value_str.substr(start, end - start + 1);
-                        try {
-                            cache_query_hit = std::stoull(value_str);
-                        } catch (...) {
-                            cache_query_hit = 0;
-                        }
-                    }
-                }
-            }
-            
-            // Parse num_requests_running - format: vllm:num_requests_running{...} value
-            if (line_str.find("vllm:num_requests_running") != std::string::npos && line_str[0] != '#') {
-                size_t brace = line_str.find_last_of('}');
-                if (brace != std::string::npos && brace + 1 < line_str.length()) {
-                    std::string value_str = line_str.substr(brace + 1);
-                    size_t start = value_str.find_first_not_of(" \t\r\n");
-                    if (start != std::string::npos) {
-                        size_t end = value_str.find_last_not_of(" \t\r\n");
-                        value_str = value_str.substr(start, end - start + 1);
-                        try {
-                            double val = std::stod(value_str);
-                            requests_running = static_cast<unsigned int>(val);
-                        } catch (...) {
-                            requests_running = 0;
-                        }
-                    }
+    size_t name_end = line.find_first_of("{ ");
+    if (name_end == std::string_view::npos) return;
+    std::string_view name = line.substr(0, name_end);
+    
+    if (name == "vllm:cache_config_info") {
+        scrape.found_cache_config = true;
+        size_t num_blocks_pos = line.find("num_gpu_blocks=\"", name_end);
+        if (num_blocks_pos != std::string_view::npos) {
+            unsigned long long blocks = 0;
+            bool has_digits = false;
+            for (size_t i = num_blocks_pos + 16; i < line.size() && line[i] != '"'; ++i) {
+                if (std::isdigit(static_cast<unsigned char>(line[i]))) {
+                    blocks = blocks * 10 + (line[i] - '0');
+                    has_digits = true;
                 }
             }
-            
-            // Parse num_requests_waiting - format: vllm:num_requests_waiting{...} value
-            if (line_str.find("vllm:num_requests_waiting") != std::string::npos && line_str[0] != '#') {
-                size_t brace = line_str.find_last_of('}');
-                if (brace != std::string::npos && brace + 1 < line_str.length()) {
-                    std::string value_str = line_str.substr(brace + 1);
-                    size_t start = value_str.find_first_not_of(" \t\r\n");
-                    if (start != std::string::npos) {
-                        size_t end = value_str.find_last_not_of(" \t\r\n");
-                        value_str = value_str.substr(start, end - start + 1);
-                        try {
-                            double val = std::stod(value_str);
-                            requests_waiting = static_cast<unsigned int>(val);
-                        } catch (...) {
-                            requests_waiting = 0;
-                        }
-                    }
-                }
+            if (has_digits) {
+                scrape.model_blocks = blocks;
             }
         }
-        
-        pclose(curl);
-        
-        // Calculate hit rate from counters
-        if (cache_query_total > 0) {
-            model_prefix_hit_rate = (double(cache_query_hit) / double(cache_query_total)) * 100.0;
-            if (model_prefix_hit_rate < 0.0) model_prefix_hit_rate = 0.0;
-            if (model_prefix_hit_rate > 100.0) model_prefix_hit_rate = 100.0;
+        return;
+    }
+    
+    double value = 0.0;
+    if (name == "vllm:kv_cache_usage_perc") {
+        scrape.kv_usage = parseSampleValue(line, name_end, value) ? std::clamp(value, 0.0, 1.0) : 0.0;
+    } else if (name == "vllm:prefix_cache_queries_total") {
+        scrape.cache_query_total = parseSampleValue(line, name_end, value) && value > 0 ? static_cast<unsigned long long>(value) : 0;
+    } else if (name == "vllm:prefix_cache_hits_total") {
+        scrape.cache_query_hit = parseSampleValue(line, name_end, value) && value > 0 ? static_cast<unsigned long long>(value) : 0;
+    } else if (name == "vllm:num_requests_running") {
+        scrape.requests_running = parseSampleValue(line, name_end, value) && value > 0 ? static_cast<unsigned int>(value) : 0;
+    } else if (name == "vllm:num_requests_waiting") {
+        scrape.requests_waiting = parseSampleValue(line, name_end, value) && value > 0 ? static_cast<unsigned int>(value) : 0;
+    }
+}
+
+static const auto METRICS_CONNECT_TIMEOUT = std::chrono::milliseconds(1000);
+static const auto METRICS_REQUEST_TIMEOUT = std::chrono::milliseconds(1500);
+
+// Keep-alive connection to one model's metrics endpoint. Scrapes of the same
+// endpoint are serialized on its mutex; different models scrape in parallel.
+struct ResolveResult {
+    beast::error_code ec;
+    tcp::resolver::results_type endpoints;
+    bool done = false;
+};
+
+struct MetricsConnection {
+    std::mutex mutex;
+    net::io_context ioc;
+    beast::tcp_stream stream{ioc};
+    tcp::resolver resolver{ioc};
+    std::shared_ptr<ResolveResult> pending_resolve;  // A lookup that outlived its deadline
+    bool connected = false;
+};
+
+static std::map<std::string, std::shared_ptr<MetricsConnection>> metrics_connections;
+static std::mutex metrics_connections_mutex;
+
+static std::shared_ptr<MetricsConnection> getMetricsConnection(const std::string& endpoint) {
+    std::lock_guard<std::mutex> lock(metrics_connections_mutex);
+    auto& connection = metrics_connections[endpoint];
+    if (!connection) {
+        connection = std::make_shared<MetricsConnection>();
+    }
+    return connection;
+}
+
+// Drop connections to endpoints that no longer belong to a running model
+static void pruneMetricsConnections(const std::vector<DeployedModel>& models, const std::string& vllm_host) {
+    // Build the live endpoint keys once so each connection is checked with one lookup
+    std::unordered_set<std::string> live_endpoints;
+    for (const auto& model : models) {
+        live_endpoints.insert(vllm_host + ":" + std::to_string(model.port));
+    }
+    
+    std::lock_guard<std::mutex> lock(metrics_connections_mutex);
+    auto it = metrics_connections.begin();
+    while (it != metrics_connections.end()) {
+        it = live_endpoints.count(it->first) ? std::next(it) : metrics_connections.erase(it);
+    }
+}
+
+static void closeMetricsConnection(MetricsConnection& conn) {
+    beast::error_code ec;
+    conn.stream.socket().shutdown(tcp::socket::shutdown_both, ec);
+    conn.stream.close();
+    conn.connected = false;
+}
+
+// Resolve the endpoint by `deadline`. getaddrinfo can't be interrupted, so a lookup that
+// misses it is left to finish in the background, writing only to its own shared result;
+// later scrapes fail fast until it has, so no run() on this io_context waits on it.
+static bool resolveMetricsHost(MetricsConnection& conn, const std::string& host, int port,
+                               std::chrono::steady_clock::time_point deadline,
+                               tcp::resolver::results_type& endpoints, beast::error_code& ec) {
+    if (conn.pending_resolve) {
+        conn.ioc.restart();
+        conn.ioc.poll();
+        if (!conn.pending_resolve->done) {
+            ec = net::error::timed_out;
+            return false;
         }
+        conn.pending_resolve.reset();
+    }
+    
+    auto result = std::make_shared<ResolveResult>();
+    conn.resolver.async_resolve(host, std::to_string(port),
+                                [result](beast::error_code e, tcp::resolver::results_type results) {
+        result->ec = e;
+        result->endpoints = std::move(results);
+        result->done = true;
+    });
+    conn.ioc.restart();
+    conn.ioc.run_until(deadline);
+    if (!result->done) {
+        conn.resolver.cancel();
+        conn.pending_resolve = result;
+        ec = net::error::timed_out;
+        return false;
+    }
+    
+    ec = result->ec;
+    if (ec) return false;
+    endpoints = std::move(result->endpoints);
+    return true;
+}
+
+// One GET /metrics over the connection, opening it first if needed. Runs the
+// async operations to completion on the connection's own io_context so deadlines
+// bound every step: resolve and connect share METRICS_CONNECT_TIMEOUT, and the
+// exchange gets METRICS_REQUEST_TIMEOUT. Caller holds conn.mutex.
+static bool requestMetrics(MetricsConnection& conn, const std::string& host, int port,
+                           std::string& body, beast::error_code& ec) {
+    ec = {};
+    
+    if (!conn.connected) {
+        auto connect_deadline = std::chrono::steady_clock::now() + METRICS_CONNECT_TIMEOUT;
+        tcp::resolver::results_type endpoints;
+        if (!resolveMetricsHost(conn, host, port, connect_deadline, endpoints, ec)) return false;
         
-        // Aggregate data from this model
-        if (model_blocks > 0) {
-            total_blocks += model_blocks;
-            total_kv_usage += model_kv_usage;
-            total_prefix_hit_rate += model_prefix_hit_rate;
-            active_models++;
-            
-            // Estimate block size (16KB is typical)
-            if (total_block_size == 0) {
-                total_block_size = 16 * 1024; // Default 16KB per block
-            }
+        conn.stream.expires_at(connect_deadline);
+        conn.stream.async_connect(endpoints, [&ec](beast::error_code e, const tcp::endpoint&) { ec = e; });
+        conn.ioc.restart();
+        conn.ioc.run();
+        if (ec) {
+            closeMetricsConnection(conn);
+            return false;
         }
+        conn.connected = true;
     }
     
-    // Set aggregated data
-    if (total_blocks > 0 && active_models > 0) {
-        data.num_gpu_blocks = total_blocks;
-        data.block_size = total_block_size;
-        data.kv_cache_usage_perc = total_kv_usage / active_models; // Average across models
-        data.prefix_cache_hit_rate = total_prefix_hit_rate / active_models; // Average across models
-        data.available = true;
+    http::request<http::empty_body> req{http::verb::get, "/metrics", 11};
+    req.set(http::field::host, host);
+    req.keep_alive(true);
+    
+    beast::flat_buffer buffer;
+    http::response<http::string_body> res;
+    conn.stream.expires_after(METRICS_REQUEST_TIMEOUT);
+    http::async_write(conn.stream, req, [&](beast::error_code e, std::size_t) {
+        ec = e;
+        if (!ec) {
+            http::async_read(conn.stream, buffer, res, [&ec](beast::error_code e, std::size_t) { ec = e; });
+        }
+    });
+    conn.ioc.restart();
+    conn.ioc.run();
+    
+    if (ec || !res.keep_alive()) {
+        closeMetricsConnection(conn);
     }
+    if (ec || res.result() != http::status::ok) return false;
     
-    return data;
+    body = std::move(res.body());
+    return true;
+}
+
+// GET the metrics text, reusing the endpoint's connection. A reused connection the
+// server has since closed fails at once, so that case alone is retried on a fresh one;
+// a timeout is not, or one scrape could spend its deadlines twice.
+static bool fetchMetricsText(const std::string& host, int port, std::string& body) {
+    auto conn = getMetricsConnection(host + ":" + std::to_string(port));
+    std::lock_guard<std::mutex> lock(conn->mutex);
+    
+    bool reused = conn->connected;
+    beast::error_code ec;
+    if (requestMetrics(*conn, host, port, body, ec)) return true;
+    
+    bool closed_by_peer = ec == http::error::end_of_stream ||
+                          ec == net::error::eof ||
+                          ec == net::error::connection_reset ||
+                          ec == net::error::broken_pipe;
+    return reused && closed_by_peer && requestMetrics(*conn, host, port, body, ec);
+}
+
+// Scrape and parse one model's /metrics endpoint
+static ModelBlockData fetchModelBlockData(const DeployedModel& model, const std::string& vllm_host) {
+    LOG_DEBUG("Fetching metrics for model " + model.model_id + " on port " + std::to_string(model.port));
+    
+    ModelBlockData model_data{model.model_id, model.port};
+    
+    LOG_DEBUG("Fetching metrics from http://" + vllm_host + ":" + std::to_string(model.port) + "/metrics");
+    std::string body;
+    bool fetched = fetchMetricsText(vllm_host, model.port, body);
+    
+    int line_count = 0;
+    MetricsScrape scrape;
+    std::string_view text(body);
+    while (!text.empty()) {
+        size_t eol = text.find('\n');
+        std::string_view line = text.substr(0, eol);
+        text.remove_prefix(eol == std::string_view::npos ? text.size() : eol + 1);
+        line_count++;
+        parseMetricsLine(line, scrape);
+    }
+    
+    LOG_DEBUG("Model " + model.model_id + ": fetch " + (fetched ? "succeeded" : "failed") + 
+             ", read " + std::to_string(line_count) + " lines" +
+             ", found_cache_config=" + (scrape.found_cache_config ? "true" : "false") +
+             ", model_blocks=" + std::to_string(scrape.model_blocks) +
+             ", kv_usage=" + std::to_string(scrape.kv_usage));
+    
+    // Calculate hit rate from counters
+    double model_prefix_hit_rate = 0.0;
+    if (scrape.cache_query_total > 0) {
+        model_prefix_hit_rate = (double(scrape.cache_query_hit) / double(scrape.cache_query_total)) * 100.0;
+        if (model_prefix_hit_rate < 0.0) model_prefix_hit_rate = 0.0;
+        if (model_prefix_hit_rate > 100.0) model_prefix_hit_rate = 100.0;
+    }
+    
+    // Set model data
+    if (scrape.model_blocks > 0) {
+        model_data.num_gpu_blocks = scrape.model_blocks;
+        model_data.block_size = 16 * 1024; // Default 16KB per block
+        model_data.kv_cache_usage_perc = scrape.kv_usage;
+        model_data.prefix_cache_hit_rate = model_prefix_hit_rate;
+        model_data.num_requests_running = scrape.requests_running;
+        model_data.num_requests_waiting = scrape.requests_waiting;
+        model_data.available = true;
+        LOG_DEBUG("Model " + model.model_id + " metrics: blocks=" + std::to_string(scrape.model_blocks) +
+                 ", kv_usage=" + std::to_string(scrape.kv_usage) +
+                 ", prefix_hit_rate=" + std::to_string(model_prefix_hit_rate));
+    } else {
+        LOG_DEBUG("Model " + model.model_id + " has 0 blocks (line_count=" + std::to_string(line_count) + 
+                 "), marking as unavailable");
+    }
+    
+    return model_data;
+}
+
+static const std::size_t MAX_SCRAPE_WORKERS = 32;
+
+// Workers shared by every scrape (stream, sampler, /vram), instead of spawning a thread
+// per model per poll. Sized to MAX_CONCURRENT_MODELS, or to the running model count when
+// that is larger (containers started outside /deploy are scraped too), up to
+// MAX_SCRAPE_WORKERS. A pool can't grow, so a larger one replaces it; callers keep the
+// pool they posted to until their results are in, so the old one is idle when joined.
+static std::shared_ptr<net::thread_pool> scrapePool(std::size_t model_count) {
+    static std::mutex pool_mutex;
+    static std::shared_ptr<net::thread_pool> pool;
+    static std::size_t pool_size = 0;
+    
+    std::size_t wanted = std::max(static_cast<std::size_t>(std::max(1, getMaxConcurrentModels())), model_count);
+    wanted = std::min(wanted, MAX_SCRAPE_WORKERS);
+    
+    std::lock_guard<std::mutex> lock(pool_mutex);
+    if (!pool || wanted > pool_size) {
+        pool = std::make_shared<net::thread_pool>(wanted);
+        pool_size = wanted;
+    }
+    return pool;
 }
 
 std::vector<ModelBlockData> fetchPerModelBlockData() {
     std::vector<ModelBlockData> models_data;
     
-    // Get all deployed models and filter to only running ones
-    auto all_models = listDeployedModels();
-    std::vector<DeployedModel> models;
-    for (const auto& model : all_models) {
-        if (model.running) {
-            models.push_back(model);
-        }
-    }
-    LOG_DEBUG("fetchPerModelBlockData: Found " + std::to_string(all_models.size()) + " total models, " + std::to_string(models.size()) + " running");
+    // listDeployedModels only returns running containers, no need to re-filter
+    auto models = listDeployedModels();
+    LOG_DEBUG("fetchPerModelBlockData: Found " + std::to_string(models.size()) + " running models");
+    
+    // Try to get host from environment, default to localhost (same for every model)
+    const std::string vllm_host = getEnvValue("VLLM_HOST", "localhost");
+    pruneMetricsConnections(models, vllm_host);
     
+    // Scrape every model concurrently; each request can take up to its timeouts,
+    // so a serial loop made one poll cost the sum of all model latencies. Tasks own
+    // copies of their inputs: the pool is shared, so a task may still be queued if
+    // this function unwinds early.
+    auto pool = scrapePool(models.size());
+    std::vector<std::future<ModelBlockData>> pending;
+    pending.reserve(models.size());
     for (const auto& model : models) {
-        LOG_DEBUG("Fetching metrics for model " + model.model_id + " on port " + std::to_string(model.port));
-        
-        ModelBlockData model_data;
-        model_data.model_id = model.model_id;
-        model_data.port = model.port;
-        model_data.num_gpu_blocks = 0;
-        model_data.block_size = 0;
-        model_data.kv_cache_usage_perc = 0.0;
-        model_data.prefix_cache_hit_rate = 0.0;
-        model_data.num_requests_running = 0;
-        model_data.num_requests_waiting = 0;
-        model_data.available = false;
-        
-        // Use timeout wrapper to ensure curl doesn't hang
-        // Try to get host from environment, default to localhost
-        std::string vllm_host = getEnvValue("VLLM_HOST", "localhost");
-        std::ostringstream cmd;
-        cmd << "timeout 2 bash -c 'curl -s --max-time 1.5 --connect-timeout 1.0 http://" 
-            << vllm_host << ":" << model.port << "/metrics 2>/dev/null || echo'";
-        
-        FILE* curl = popen(cmd.str().c_str(), "r");
-        if (!curl) {
-            LOG_DEBUG("Failed to open curl pipe for model " + model.model_id);
-            models_data.push_back(model_data);
-            continue;
-        }
-        
-        LOG_DEBUG("Fetching metrics from http://" + vllm_host + ":" + std::to_string(model.port) + "/metrics");
-        char line[4096];
-        int line_count = 0;
-        unsigned long long model_blocks = 0;
-        double model_kv_usage = 0.0;
-        double model_prefix_hit_rate = 0.0;
-        unsigned long long cache_query_total = 0;
-        unsigned long long cache_query_hit = 0;
-        unsigned int requests_running = 0;
-        unsigned int requests_waiting = 0;
-        bool found_cache_config = false;
-        
-        while (fgets(line, sizeof(line), curl)) {
-            line_count++;
-            std::string line_str(line);
-            
-            size_t pos = line_str.find("vllm:cache_config_info");
-            if (pos != std::string::npos) {
-                found_cache_config = true;
-                size_t num_blocks_pos = line_str.find("num_gpu_blocks=\"", pos);
-                if (num_blocks_pos != std::string::npos) {
-                    num_blocks_pos += 16;
-                    size_t num_blocks_end = line_str.find("\"", num_blocks_pos);
-                    if (num_blocks_end != std::string::npos) {
-                        std::string value_str = line_str.substr(num_blocks_pos, num_blocks_end - num_blocks_pos);
-                        std::string digits;
-                        for (char c : value_str) {
-                            if (std::isdigit(c)) digits += c;
-                        }
-                        if (!digits.empty()) {
-                            model_blocks = std::stoull(digits);
-                        }
-                    }
-                }
-            }
-            
-            // Parse kv_cache_usage_perc - format: vllm:kv_cache_usage_perc{...} value
-            size_t kv_usage_pos = line_str.find("vllm:kv_cache_usage_perc");
-            if (kv_usage_pos != std::string::npos && line_str[0] != '#') {
-                size_t brace_end = line_str.find("}", kv_usage_pos);
-                if (brace_end != std::string::npos) {
-                    size_t value_start = line_str.find_first_not_of(" \t", brace_end + 1);
-                    if (value_start != std::string::npos) {
-                        size_t value_end = line_str.find_first_of(" \n\r", value_start);
-                        if (value_end == std::string::npos) {
-                            value_end = line_str.length();
-                        }
-                        if (value_end > value_start) {
-                            std::string value_str = line_str.substr(value_start, value_end - value_start);
-                            try {
-                                model_kv_usage = std::stod(value_str);
-                                if (model_kv_usage < 0.0) model_kv_usage = 0.0;
-                                if (model_kv_usage > 1.0) model_kv_usage = 1.0;
-                            } catch (...) {
-                                model_kv_usage = 0.0;
-                            }
-                        }
-                    }
-                }
-            }
-            
-            // Parse prefix_cache_queries_total - format: vllm:prefix_cache_queries_total{...} value
-            if (line_str.find("vllm:prefix_cache_queries_total") != std::string::npos && line_str[0] != '#') {
-                size_t brace = line_str.find_last_of('}');
-                if (brace != std::string::npos && brace + 1 < line_str.length()) {
-                    std::string value_str = line_str.substr(brace + 1);
-                    // Trim whitespace
-                    size_t start = value_str.find_first_not_of(" \t\r\n");
-                    if (start != std::string::npos) {
-                        size_t end = value_str.find_last_not_of(" \t\r\n");
-                        value_str = value_str.substr(start, end - start + 1);
-                        try {
-                            cache_query_total = std::stoull(value_str);
-                        } catch (...) {
-                            cache_query_total = 0;
-                        }
-                    }
-                }
-            }
-            
-            // Parse prefix_cache_hits_total - format: vllm:prefix_cache_hits_total{...} value
-            if (line_str.find("vllm:prefix_cache_hits_total") != std::string::npos && line_str[0] != '#') {
-                size_t brace = line_str.find_last_of('}');
-                if (brace != std::string::npos && brace + 1 < line_str.length()) {
-                    std::string value_str = line_str.substr(brace + 1);
-                    // Trim whitespace
-                    size_t start = value_str.find_first_not_of(" \t\r\n");
-                    if (start != std::string::npos) {
-                        size_t end = value_str.find_last_not_of(" \t\r\n");
-                        value_str = value_str.substr(start, end - start + 1);
-                        try {
-                            cache_query_hit = std::stoull(value_str);
-                        } catch (...) {
-                            cache_query_hit = 0;
-                        }
-                    }
-                }
-            }
-            
-            // Parse num_requests_running - format: vllm:num_requests_running{...} value
-            if (line_str.find("vllm:num_requests_running") != std::string::npos && line_str[0] != '#') {
-                size_t brace = line_str.find_last_of('}');
-                if (brace != std::string::npos && brace + 1 < line_str.length()) {
-                    std::string value_str = line_str.substr(brace + 1);
-                    size_t start = value_str.find_first_not_of(" \t\r\n");
-                    if (start != std::string::npos) {
-                        size_t end = value_str.find_last_not_of(" \t\r\n");
-                        value_str = value_str.substr(start, end - start + 1);
-                        try {
-                            double val = std::stod(value_str);
-                            requests_running = static_cast<unsigned int>(val);
-                        } catch (...) {
-                            requests_running = 0;
-                        }
-                    }
-                }
-            }
-            
-            // Parse num_requests_waiting - format: vllm:num_requests_waiting{...} value
-            if (line_str.find("vllm:num_requests_waiting") != std::string::npos && line_str[0] != '#') {
-                size_t brace = line_str.find_last_of('}');
-                if (brace != std::string::npos && brace + 1 < line_str.length()) {
-                    std::string value_str = line_str.substr(brace + 1);
-                    size_t start = value_str.find_first_not_of(" \t\r\n");
-                    if (start != std::string::npos) {
-                        size_t end = value_str.find_last_not_of(" \t\r\n");
-                        value_str = value_str.substr(start, end - start + 1);
-                        try {
-                            double val = std::stod(value_str);
-                            requests_waiting = static_cast<unsigned int>(val);
-                        } catch (...) {
-                            requests_waiting = 0;
-                        }
-                    }
-                }
-            }
-        }
-        
-        int curl_status = pclose(curl);
-        LOG_DEBUG("Model " + model.model_id + ": curl returned " + std::to_string(curl_status) + 
-                 ", read " + std::to_string(line_count) + " lines" +
-                 ", found_cache_config=" + (found_cache_config ? "true" : "false") +
-                 ", model_blocks=" + std::to_string(model_blocks) +
-                 ", kv_usage=" + std::to_string(model_kv_usage));
-        
-        // Calculate hit rate from counters
-        if (cache_query_total > 0) {
-            model_prefix_hit_rate = (double(cache_query_hit) / double(cache_query_total)) * 100.0;
-            if (model_prefix_hit_rate < 0.0) model_prefix_hit_rate = 0.0;
-            if (model_prefix_hit_rate > 100.0) model_prefix_hit_rate = 100.0;
-        }
-        
-        // Set model data
-        if (model_blocks > 0) {
-            model_data.num_gpu_blocks = model_blocks;
-            model_data.block_size = 16 * 1024; // Default 16KB per block
-            model_data.kv_cache_usage_perc = model_kv_usage;
-            model_data.prefix_cache_hit_rate = model_prefix_hit_rate;
-            model_data.num_requests_running = requests_running;
-            model_data.num_requests_waiting = requests_waiting;
-            model_data.available = true;
-            LOG_DEBUG("Model " + model.model_id + " metrics: blocks=" + std::to_string(model_blocks) +
-                     ", kv_usage=" + std::to_string(model_kv_usage) +
-                     ", prefix_hit_rate=" + std::to_string(model_prefix_hit_rate));
-        } else {
-            LOG_DEBUG("Model " + model.model_id + " has 0 blocks (line_count=" + std::to_string(line_count) + 
-                     "), marking as unavailable");
-        }
-        
-        models_data.push_back(model_data);
+        std::packaged_task<ModelBlockData()> task([model, vllm_host] {
+            return fetchModelBlockData(model, vllm_host);
+        });
+        pending.push_back(task.get_future());
+        net::post(*pool, std::move(task));
+    }
+    
+    models_data.reserve(pending.size());
+    for (auto& result : pending) {
+        models_data.push_back(result.get());
     }
     
     return models_data;
 }
+
+VLLMBlockData fetchVLLMBlockData() {
+    VLLMBlockData data{0, 0, 0.0, 0.0, false};
+    
+    unsigned long long total_blocks = 0;
+    double total_kv_usage = 0.0;
+    double total_prefix_hit_rate = 0.0;
+    int active_models = 0;
+    
+    // Aggregate the per-model scrape rather than parsing /metrics a second way
+    for (const auto& model_data : fetchPerModelBlockData()) {
+        if (model_data.available) {
+            total_blocks += model_data.num_gpu_blocks;
+            total_kv_usage += model_data.kv_cache_usage_perc;
+            total_prefix_hit_rate += model_data.prefix_cache_hit_rate;
+            active_models++;
+        }
+    }
+    
+    // Set aggregated data
+    if (total_blocks > 0 && active_models > 0) {
+        data.num_gpu_blocks = total_blocks;
+        data.block_size = 16 * 1024; // Default 16KB per block
+        data.kv_cache_usage_perc = total_kv_usage / active_models; // Average across models
+        data.prefix_cache_hit_rate = total_prefix_hit_rate / active_models; // Average across models
+        data.available = true;
+    }
+    
+    return data;
+}
@@ -6,9 +6,10 @@
 #include <algorithm>
 #include <string>
 #include <map>
+#include <mutex>
 
 static std::map<std::string, std::string> env_cache;
-static bool env_loaded = false;
+static std::once_flag env_loaded;
 
 std::map<std::string, std::string> loadEnvFile(const std::string& path) {
     std::map<std::string, std::string> env;
@@ -66,27 +67,29 @@ std::map<std::string, std::string> loadEnvFile(const std::string& path) {
     return env;
 }
 
-std::string getEnvValue(const std::string& key, const std::string& default_val) {
-    if (!env_loaded) {
-        // Try project root .env first (if BLACKBOX_ROOT is set)
-        const char* project_root = std::getenv("BLACKBOX_ROOT");
-        if (project_root) {
-            std::string root_env = std::string(project_root) + "/.env";
-            env_cache = loadEnvFile(root_env);
-        } else {
-            // Try current directory .env
-            env_cache = loadEnvFile(".env");
-        }
-        
-        // Also try home .env as fallback
-        const char* home = std::getenv("HOME");
-        if (home) {
-            std::string home_env = std::string(home) + "/.env";
-            auto home_cache = loadEnvFile(home_env);
-            env_cache.insert(home_cache.begin(), home_cache.end());
-        }
-        env_loaded = true;
+// Read the .env files once; callers run on request workers and background threads
+static void loadEnvCache() {
+    // Try project root .env first (if BLACKBOX_ROOT is set)
+    const char* project_root = std::getenv("BLACKBOX_ROOT");
+    if (project_root) {
+        std::string root_env = std::string(project_root) + "/.env";
+        env_cache = loadEnvFile(root_env);
+    } else {
+        // Try current directory .env
+        env_cache = loadEnvFile(".env");
+    }
+    
+    // Also try home .env as fallback
+    const char* home = std::getenv("HOME");
+    if (home) {
+        std::string home_env = std::string(home) + "/.env";
+        auto home_cache = loadEnvFile(home_env);
+        env_cache.insert(home_cache.begin(), home_cache.end());
     }
+}
+
+std::string getEnvValue(const std::string& key, const std::string& default_val) {
+    std::call_once(env_loaded, loadEnvCache);
     
     const char* env_val = std::getenv(key.c_str());
     if (env_val) {
@@ -102,9 +105,7 @@ std::string getEnvValue(const std::string& key, const std::string& default_val)
 }
 
 bool hasEnvKey(const std::string& key) {
-    if (!env_loaded) {
-        getEnvValue(key);
-    }
+    std::call_once(env_loaded, loadEnvCache);
     
     if (std::getenv(key.c_str())) {
         return true;
@@ -2,34 +2,47 @@
 #include <nlohmann/json.hpp>
 #include <string>
 
-std::string parseJSONField(const std::string& json, const std::string& field) {
-    try {
-        nlohmann::json j = nlohmann::json::parse(json);
-        if (j.contains(field) && j[field].is_string()) {
-            return j[field].get<std::string>();
-        }
-    } catch (const nlohmann::json::exception& e) {
-        // Invalid JSON, return empty string
+nlohmann::json parseJSONObject(const std::string& json) {
+    // Parse without exceptions; anything that isn't an object yields an empty object
+    nlohmann::json j = nlohmann::json::parse(json, nullptr, false);
+    if (j.is_discarded() || !j.is_object()) {
+        return nlohmann::json::object();
+    }
+    return j;
+}
+
+std::string parseJSONField(const nlohmann::json& j, const std::string& field) {
+    auto it = j.find(field);
+    if (it != j.end() && it->is_string()) {
+        return it->get<std::string>();
     }
     return "";
 }
 
-int parseJSONInt(const std::string& json, const std::string& field, int default_val) {
+std::string parseJSONField(const std::string& json, const std::string& field) {
+    return parseJSONField(parseJSONObject(json), field);
+}
+
+int parseJSONInt(const nlohmann::json& j, const std::string& field, int default_val) {
     try {
-        nlohmann::json j = nlohmann::json::parse(json);
-        if (j.contains(field)) {
-            if (j[field].is_number()) {
-                return j[field].get<int>();
-            } else if (j[field].is_string()) {
-                return std::stoi(j[field].get<std::string>());
+        auto it = j.find(field);
+        if (it != j.end()) {
+            if (it->is_number()) {
+                return it->get<int>();
+            } else if (it->is_string()) {
+                return std::stoi(it->get<std::string>());
             }
         }
     } catch (const nlohmann::json::exception& e) {
-        // Invalid JSON, return default
+        // Type error, return default
     } catch (const std::exception& e) {
         // Conversion error, return default
     }
     return default_val;
 }
 
+int parseJSONInt(const std::string& json, const std::string& field, int default_val) {
+    return parseJSONInt(parseJSONObject(json), field, default_val);
+}
+
 
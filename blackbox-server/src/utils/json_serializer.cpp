@@ -1,80 +1,71 @@
 #include "utils/json_serializer.h"
-#include <sstream>
-#include <iomanip>
+#include <cstdio>
+#include <algorithm>
+#include <absl/strings/str_cat.h>
 
-std::string createDetailedResponse(const DetailedVRAMInfo& info) {
-    std::ostringstream oss;
-    // Simplified response: total VRAM, allocated VRAM, used KV cache bytes, prefix cache hit rate, and per-model breakdown
-    oss << R"({"total_vram_bytes":)" << info.total
-        << R"(,"allocated_vram_bytes":)" << info.used
-        << R"(,"used_kv_cache_bytes":)" << info.used_kv_cache_bytes
-        << R"(,"prefix_cache_hit_rate":)" << std::fixed << std::setprecision(2) << info.prefix_cache_hit_rate
-        << R"(,"models":[)";
-    
-    for (size_t i = 0; i < info.models.size(); ++i) {
-        if (i > 0) oss << ",";
-        const auto& model = info.models[i];
-        oss << R"({"model_id":")" << model.model_id << R"(")"
-            << R"(,"port":)" << model.port
-            << R"(,"allocated_vram_bytes":)" << model.allocated_vram_bytes
-            << R"(,"used_kv_cache_bytes":)" << model.used_kv_cache_bytes
-            << "}";
+// Responses are appended straight into one reserved string instead of going
+// through an ostringstream (locale-aware formatting plus a final copy out).
+// appendFixed2 gives the same output as std::fixed << std::setprecision(2).
+static void appendFixed2(std::string& out, double value) {
+    char buffer[64];
+    int len = std::snprintf(buffer, sizeof(buffer), "%.2f", value);
+    if (len > 0) {
+        out.append(buffer, std::min(static_cast<size_t>(len), sizeof(buffer) - 1));
     }
-    
-    oss << "]}";
-    return oss.str();
 }
 
-std::string createAggregatedResponse(const AggregatedVRAMInfo& info) {
-    std::ostringstream oss;
-    oss << std::fixed << std::setprecision(2);
-    
-    oss << R"({"total_vram_bytes":)" << info.total_vram_bytes
-        << R"(,"window_seconds":)" << info.window_seconds
-        << R"(,"sample_count":)" << info.sample_count
-        << R"(,"allocated_vram_bytes":{"min":)" << info.allocated_vram_bytes.min
-        << R"(,"max":)" << info.allocated_vram_bytes.max
-        << R"(,"avg":)" << info.allocated_vram_bytes.avg
-        << R"(,"p95":)" << info.allocated_vram_bytes.p95
-        << R"(,"p99":)" << info.allocated_vram_bytes.p99
-        << R"(,"count":)" << info.allocated_vram_bytes.count << "}"
-        << R"(,"used_kv_cache_bytes":{"min":)" << info.used_kv_cache_bytes.min
-        << R"(,"max":)" << info.used_kv_cache_bytes.max
-        << R"(,"avg":)" << info.used_kv_cache_bytes.avg
-        << R"(,"p95":)" << info.used_kv_cache_bytes.p95
-        << R"(,"p99":)" << info.used_kv_cache_bytes.p99
-        << R"(,"count":)" << info.used_kv_cache_bytes.count << "}"
-        << R"(,"prefix_cache_hit_rate":{"min":)" << info.prefix_cache_hit_rate.min
-        << R"(,"max":)" << info.prefix_cache_hit_rate.max
-        << R"(,"avg":)" << info.prefix_cache_hit_rate.avg
-        << R"(,"p95":)" << info.prefix_cache_hit_rate.p95
-        << R"(,"p99":)" << info.prefix_cache_hit_rate.p99
-        << R"(,"count":)" << info.prefix_cache_hit_rate.count << "}"
-        << R"(,"num_requests_running":{"min":)" << info.num_requests_running.min
-        << R"(,"max":)" << info.num_requests_running.max
-        << R"(,"avg":)" << info.num_requests_running.avg
-        << R"(,"p95":)" << info.num_requests_running.p95
-        << R"(,"p99":)" << info.num_requests_running.p99
-        << R"(,"count":)" << info.num_requests_running.count << "}"
-        << R"(,"num_requests_waiting":{"min":)" << info.num_requests_waiting.min
-        << R"(,"max":)" << info.num_requests_waiting.max
-        << R"(,"avg":)" << info.num_requests_waiting.avg
-        << R"(,"p95":)" << info.num_requests_waiting.p95
-        << R"(,"p99":)" << info.num_requests_waiting.p99
-        << R"(,"count":)" << info.num_requests_waiting.count << "}"
-        << R"(,"models":[)";
-    
-    for (size_t i = 0; i < info.models.size(); ++i) {
-        if (i > 0) oss << ",";
-        const auto& model = info.models[i];
-        oss << R"({"model_id":")" << model.model_id << R"(")"
-            << R"(,"port":)" << model.port
-            << R"(,"allocated_vram_bytes":)" << model.allocated_vram_bytes
-            << R"(,"used_kv_cache_bytes":)" << model.used_kv_cache_bytes
-            << "}";
+static void appendStats(std::string& out, const char* name, const AggregatedStats& stats) {
+    absl::StrAppend(&out, ",\"", name, "\":{\"min\":");
+    appendFixed2(out, stats.min);
+    out += ",\"max\":";
+    appendFixed2(out, stats.max);
+    out += ",\"avg\":";
+    appendFixed2(out, stats.avg);
+    out += ",\"p95\":";
+    appendFixed2(out, stats.p95);
+    out += ",\"p99\":";
+    appendFixed2(out, stats.p99);
+    absl::StrAppend(&out, ",\"count\":", stats.count, "}");
+}
+
+static void appendModels(std::string& out, const std::vector<ModelVRAMInfo>& models) {
+    out += ",\"models\":[";
+    for (size_t i = 0; i < models.size(); ++i) {
+        if (i > 0) out += ',';
+        const auto& model = models[i];
+        absl::StrAppend(&out, R"({"model_id":")", model.model_id, R"(")",
+                        R"(,"port":)", model.port,
+                        R"(,"allocated_vram_bytes":)", model.allocated_vram_bytes,
+                        R"(,"used_kv_cache_bytes":)", model.used_kv_cache_bytes,
+                        "}");
     }
-    
-    oss << "]}";
-    return oss.str();
+    out += "]}";
 }
 
+std::string createDetailedResponse(const DetailedVRAMInfo& info) {
+    std::string out;
+    out.reserve(128 + info.models.size() * 128);
+    // Simplified response: total VRAM, allocated VRAM, used KV cache bytes, prefix cache hit rate, and per-model breakdown
+    absl::StrAppend(&out, R"({"total_vram_bytes":)", info.total,
+                    R"(,"allocated_vram_bytes":)", info.used,
+                    R"(,"used_kv_cache_bytes":)", info.used_kv_cache_bytes,
+                    R"(,"prefix_cache_hit_rate":)");
+    appendFixed2(out, info.prefix_cache_hit_rate);
+    appendModels(out, info.models);
+    return out;
+}
+
+std::string createAggregatedResponse(const AggregatedVRAMInfo& info) {
+    std::string out;
+    out.reserve(768 + info.models.size() * 128);
+    absl::StrAppend(&out, R"({"total_vram_bytes":)", info.total_vram_bytes,
+                    R"(,"window_seconds":)", info.window_seconds,
+                    R"(,"sample_count":)", info.sample_count);
+    appendStats(out, "allocated_vram_bytes", info.allocated_vram_bytes);
+    appendStats(out, "used_kv_cache_bytes", info.used_kv_cache_bytes);
+    appendStats(out, "prefix_cache_hit_rate", info.prefix_cache_hit_rate);
+    appendStats(out, "num_requests_running", info.num_requests_running);
+    appendStats(out, "num_requests_waiting", info.num_requests_waiting);
+    appendModels(out, info.models);
+    return out;
+}
@@ -1,12 +1,12 @@
 #include "utils/logger.h"
 #include "utils/env_utils.h"
 #include <iostream>
-#include <sstream>
-#include <iomanip>
+#include <cstdio>
 #include <ctime>
 #include <cstring>
 #include <cctype>
 #include <algorithm>
+#include <mutex>
 
 // Initialize log level from environment variable or default to INFO
 LogLevel Logger::current_level = []() {
@@ -29,10 +29,21 @@ std::string Logger::getTimestamp() {
     auto ms = std::chrono::duration_cast<std::chrono::milliseconds>(
         now.time_since_epoch()) % 1000;
     
-    std::stringstream ss;
-    ss << std::put_time(std::localtime(&time), "%Y-%m-%d %H:%M:%S");
-    ss << "." << std::setfill('0') << std::setw(3) << ms.count();
-    return ss.str();
+    // The date/time part only changes once a second, so each thread keeps the last
+    // one it formatted and skips localtime/strftime for the other lines in that second.
+    // localtime_r also avoids the shared static buffer std::localtime returns.
+    thread_local std::time_t cached_time = -1;
+    thread_local char cached_prefix[32];
+    if (time != cached_time) {
+        std::tm local_tm{};
+        localtime_r(&time, &local_tm);
+        std::strftime(cached_prefix, sizeof(cached_prefix), "%Y-%m-%d %H:%M:%S", &local_tm);
+        cached_time = time;
+    }
+    
+    char timestamp[40];
+    std::snprintf(timestamp, sizeof(timestamp), "%s.%03d", cached_prefix, static_cast<int>(ms.count()));
+    return timestamp;
 }
 
 std::string Logger::levelToString(LogLevel level) {
@@ -82,7 +93,15 @@ void Logger::log(LogLevel level, const std::string& message) {
     std::string level_str = levelToString(level);
     std::string colored_level = colorize(level, level_str);
     
-    std::cerr << "[" << timestamp << "] [" << colored_level << "] " << message << std::endl;
+    // Assemble the whole line first: std::cerr is unit-buffered, so every << was its
+    // own write(2), and lines from different threads could interleave mid-record
+    std::string line;
+    line.reserve(timestamp.size() + colored_level.size() + message.size() + 8);
+    line.append("[").append(timestamp).append("] [").append(colored_level).append("] ").append(message).append("\n");
+    
+    static std::mutex output_mutex;
+    std::lock_guard<std::mutex> lock(output_mutex);
+    std::cerr.write(line.data(), static_cast<std::streamsize>(line.size()));
 }
 
 void Logger::debug(const std::string& message) {